@@ -1,350 +1,224 @@
-import tkinter as tk
-from tkinter import messagebox
-import time
-import math
-import random
-
-BOARD_SIZE = 15
-CELL_SIZE = 30
-WIN_COUNT = 5
-DEPTH_LIMIT = 2
-ALPHABETA_DEPTH = 2
-
-
-class GomokuGUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Gomoku AI vs AI (Minimax vs Alpha-Beta)")
-        self.state = ['-'] * (BOARD_SIZE * BOARD_SIZE)
-        self.current_player = 'black'
-        self.first_move_done = False
-        self.game_over = False
-
-        # Setup UI
-        self.setup_ui()
-
-        # Start the game
-        self.root.after(500, self.play_turn)
-
-    def setup_ui(self):
-        # Create a frame for controls
-        control_frame = tk.Frame(self.root)
-        control_frame.pack(pady=10)
-
-        # Status label
-        self.status_label = tk.Label(control_frame, text="Starting game...", font=('Arial', 12))
-        self.status_label.pack(side=tk.LEFT, padx=10)
-
-        # Reset button
-        self.reset_button = tk.Button(control_frame, text="Reset Game", command=self.reset_game)
-        self.reset_button.pack(side=tk.LEFT, padx=10)
-
-        # Create canvas for the board
-        self.canvas = tk.Canvas(self.root,
-                                width=BOARD_SIZE * CELL_SIZE,
-                                height=BOARD_SIZE * CELL_SIZE,
-                                bg='bisque')
-        self.canvas.pack(pady=10)
-
-        # Draw the board
-        self.draw_board()
-
-    def draw_board(self):
-        """Draw the Gomoku board with grid lines"""
-        self.canvas.delete("all")
-
-        # Draw grid lines
-        for i in range(BOARD_SIZE):
-            # Horizontal lines
-            self.canvas.create_line(0, i * CELL_SIZE,
-                                    BOARD_SIZE * CELL_SIZE, i * CELL_SIZE)
-            # Vertical lines
-            self.canvas.create_line(i * CELL_SIZE, 0,
-                                    i * CELL_SIZE, BOARD_SIZE * CELL_SIZE)
-
-        # Draw stones
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                idx = i * BOARD_SIZE + j
-                if self.state[idx] != '-':
-                    x1 = j * CELL_SIZE + 5
-                    y1 = i * CELL_SIZE + 5
-                    x2 = (j + 1) * CELL_SIZE - 5
-                    y2 = (i + 1) * CELL_SIZE - 5
-                    fill_color = 'black' if self.state[idx] == 'black' else 'white'
-                    self.canvas.create_oval(x1, y1, x2, y2, fill=fill_color, outline='black')
-
-    def play_turn(self):
-        if self.game_over:
-            return
-
-        if is_terminal(self.state, True):
-            winner = get_winner(self.state)
-            if winner != '-':
-                message = f"{winner.capitalize()} wins!"
-                self.status_label.config(text=message)
-                self.game_over = True
-            else:
-                message = "It's a draw!"
-                self.status_label.config(text=message)
-                self.game_over = True
-            return
-
-        start_time = time.time()
-
-        if not self.first_move_done:
-            # Random first move
-            empty_indices = [i for i, v in enumerate(self.state) if v == '-']
-            if empty_indices:
-                idx = random.choice(empty_indices)
-                self.state[idx] = self.current_player
-                self.first_move_done = True
-                self.draw_board()
-                self.status_label.config(text=f"Random first move by {self.current_player}")
-                print(f"{self.current_player} (random) moved in {time.time() - start_time:.2f}s")
-                self.current_player = other_player(self.current_player)
-                self.root.after(500, self.play_turn)
-            else:
-                print("Error: No valid moves left for random selection.")
-            return
-        else:
-            # AI turn
-            if self.current_player == 'black':
-                self.status_label.config(text="Alpha-Beta (Black) thinking...")
-                new_state = alphabeta(self.state, -float('inf'), float('inf'), 'black', ALPHABETA_DEPTH)
-            else:
-                self.status_label.config(text="Minimax (White) thinking...")
-                _, new_state = minimax(self.state, DEPTH_LIMIT, 'white', 'white')
-
-            if new_state:
-                self.state = new_state
-            else:
-                print("Error: AI returned an invalid state!")
-
-            self.draw_board()
-            print(f"{self.current_player} moved in {time.time() - start_time:.2f}s")
-            self.current_player = other_player(self.current_player)
-            self.root.after(500, self.play_turn)
-
-    def reset_game(self):
-        """Reset the game to initial state"""
-        self.state = ['-'] * (BOARD_SIZE * BOARD_SIZE)
-        self.current_player = 'black'
-        self.first_move_done = False
-        self.game_over = False
-        self.status_label.config(text="Starting new game...")
-        self.draw_board()
-        self.root.after(500, self.play_turn)
-
-
-# --- Game Logic Functions ---
-
-def other_player(player):
-    return 'white' if player == 'black' else 'black'
-
-
-def get_winner(state):
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if state[i * BOARD_SIZE + j] != '-':
-                if j + WIN_COUNT <= BOARD_SIZE and all(
-                        state[i * BOARD_SIZE + (j + k)] == state[i * BOARD_SIZE + j] for k in range(WIN_COUNT)):
-                    return state[i * BOARD_SIZE + j]
-                if i + WIN_COUNT <= BOARD_SIZE and all(
-                        state[(i + k) * BOARD_SIZE + j] == state[i * BOARD_SIZE + j] for k in range(WIN_COUNT)):
-                    return state[i * BOARD_SIZE + j]
-                if i + WIN_COUNT <= BOARD_SIZE and j + WIN_COUNT <= BOARD_SIZE and all(
-                        state[(i + k) * BOARD_SIZE + (j + k)] == state[i * BOARD_SIZE + j] for k in range(WIN_COUNT)):
-                    return state[i * BOARD_SIZE + j]
-                if i + WIN_COUNT <= BOARD_SIZE and j - WIN_COUNT >= -1 and all(
-                        state[(i + k) * BOARD_SIZE + (j - k)] == state[i * BOARD_SIZE + j] for k in range(WIN_COUNT)):
-                    return state[i * BOARD_SIZE + j]
-    return '-'
-
-
-def is_terminal(state, suppress_output=False):
-    winner = get_winner(state)
-    if winner != '-':
-        if not suppress_output:
-            print(f"{winner} wins!")
-        return True
-    if '-' not in state:
-        if not suppress_output:
-            print("It's a draw!")
-        return True
-    return False
-
-
-def heuristic(state):
-    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-    score = 0
-
-    def evaluate_line(x, y, dx, dy, player):
-        count = 0
-        open_ends = 0
-        i, j = x, y
-        while 0 <= i < BOARD_SIZE and 0 <= j < BOARD_SIZE and state[i * BOARD_SIZE + j] == player:
-            count += 1
-            i += dx
-            j += dy
-        if 0 <= i < BOARD_SIZE and 0 <= j < BOARD_SIZE and state[i * BOARD_SIZE + j] == '-':
-            open_ends += 1
-        i, j = x - dx, y - dy
-        while 0 <= i < BOARD_SIZE and 0 <= j < BOARD_SIZE and state[i * BOARD_SIZE + j] == player:
-            count += 1
-            i -= dx
-            j -= dy
-        if 0 <= i < BOARD_SIZE and 0 <= j < BOARD_SIZE and state[i * BOARD_SIZE + j] == '-':
-            open_ends += 1
-        if count >= WIN_COUNT:
-            return 100000
-        if count == 4 and open_ends == 2:
-            return 10000
-        if count == 4 and open_ends == 1:
-            return 1000
-        if count == 3 and open_ends == 2:
-            return 500
-        if count == 3 and open_ends == 1:
-            return 100
-        if count == 2 and open_ends == 2:
-            return 50
-        if count == 2 and open_ends == 1:
-            return 10
-        return 0
-
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if state[i * BOARD_SIZE + j] == '-':
-                continue
-            player = state[i * BOARD_SIZE + j]
-            modifier = 1 if player == 'black' else -1
-            for dx, dy in directions:
-                score += modifier * evaluate_line(i, j, dx, dy, player)
-    return score
-
-
-def move(state, player):
-    return [state[:i] + [player] + state[i + 1:] for i in range(len(state)) if state[i] == '-']
-
-
-def alphabeta(state, alpha, beta, player, depth):
-    best_move = None
-
-    def max_value(state, alpha, beta, depth):
-        if depth == 0 or is_terminal(state, True):
-            return heuristic(state)
-        v = -float('inf')
-        for s in move(state, 'black'):
-            v2 = min_value(s, alpha, beta, depth - 1)
-            if v2 > v:
-                v = v2
-                if depth == ALPHABETA_DEPTH:
-                    nonlocal best_move
-                    best_move = s
-            if v >= beta:
-                return v
-            alpha = max(alpha, v)
-        return v
-
-    def min_value(state, alpha, beta, depth):
-        if depth == 0 or is_terminal(state, True):
-            return heuristic(state)
-        v = float('inf')
-        for s in move(state, 'white'):
-            v2 = max_value(s, alpha, beta, depth - 1)
-            if v2 < v:
-                v = v2
-                if depth == ALPHABETA_DEPTH:
-                    nonlocal best_move
-                    best_move = s
-            if v <= alpha:
-                return v
-            beta = min(beta, v)
-        return v
-
-    if player == 'black':
-        max_value(state, alpha, beta, depth)
-    else:
-        min_value(state, alpha, beta, depth)
-    return best_move
-
-
-def get_neighbors(state):
-    neighbors = set()
-    for idx in range(len(state)):
-        if state[idx] != '-':
-            row = idx // BOARD_SIZE
-            col = idx % BOARD_SIZE
-            for dr in range(-1, 2):
-                for dc in range(-1, 2):
-                    r = row + dr
-                    c = col + dc
-                    if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE:
-                        new_idx = r * BOARD_SIZE + c
-                        if state[new_idx] == '-':
-                            neighbors.add(new_idx)
-    return list(neighbors) if neighbors else [i for i in range(len(state)) if state[i] == '-']
-
-
-def evaluate_line(line, player):
-    opp = other_player(player)
-    if opp in line and player in line:
-        return 0
-    count = line.count(player)
-    return [0, 10, 100, 1000, 10000, 100000][count] if count <= 5 else 0
-
-
-def evaluate_board(state, player):
-    score = 0
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if j + 5 <= BOARD_SIZE:
-                line = [state[i * BOARD_SIZE + j + k] for k in range(5)]
-                score += evaluate_line(line, player)
-                score -= evaluate_line(line, other_player(player))
-            if i + 5 <= BOARD_SIZE:
-                line = [state[(i + k) * BOARD_SIZE + j] for k in range(5)]
-                score += evaluate_line(line, player)
-                score -= evaluate_line(line, other_player(player))
-            if i + 5 <= BOARD_SIZE and j + 5 <= BOARD_SIZE:
-                line = [state[(i + k) * BOARD_SIZE + (j + k)] for k in range(5)]
-                score += evaluate_line(line, player)
-                score -= evaluate_line(line, other_player(player))
-            if i + 5 <= BOARD_SIZE and j - 4 >= 0:
-                line = [state[(i + k) * BOARD_SIZE + (j - k)] for k in range(5)]
-                score += evaluate_line(line, player)
-                score -= evaluate_line(line, other_player(player))
-    return score
-
-
-def minimax(state, depth, player, maximizing_player):
-    if is_terminal(state, True) or depth == 0:
-        return evaluate_board(state, maximizing_player), state
-    best_state = None
-    valid_moves = get_neighbors(state)
-    if player == maximizing_player:
-        max_eval = -math.inf
-        for idx in valid_moves:
-            new_state = state[:]
-            new_state[idx] = player
-            eval_score, _ = minimax(new_state, depth - 1, other_player(player), maximizing_player)
-            if eval_score > max_eval:
-                max_eval = eval_score
-                best_state = new_state
-        return max_eval, best_state
-    else:
-        min_eval = math.inf
-        for idx in valid_moves:
-            new_state = state[:]
-            new_state[idx] = player
-            eval_score, _ = minimax(new_state, depth - 1, other_player(player), maximizing_player)
-            if eval_score < min_eval:
-                min_eval = eval_score
-                best_state = new_state
-        return min_eval, best_state
-
-
-if __name__ == '__main__':
-    root = tk.Tk()
-    app = GomokuGUI(root)
+import json
+import os
+import sys
+import tkinter as tk
+from tkinter import messagebox
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import (BLACK, BOARD_SIZE, EMPTY, NAMES, WHITE, BackgroundSearch, Board, MoveOrderer,
+                    ParallelSearch, SearchStats, TranspositionTable, iterative_deepening, other_player)
+from engine.book import load_book
+
+CELL_SIZE = 30
+MOVE_TIME = 2.0  # seconds per AI move
+TT_SIZE_MB = 16
+# Processes per AI search; 1 searches in the Tk process. More uses the
+# experimental engine.parallel search, which has no measured speedup yet.
+SEARCH_WORKERS = 1
+STATS_LOG = None  # path of a JSONL file to append each move's search stats to
+
+
+class GomokuGUI:
+    def __init__(self, root):
+        # root is the Tk window or a frame to build the game in, e.g. the launcher's
+        self.root = root
+        self.root.winfo_toplevel().title("Gomoku AI vs AI (Minimax vs Alpha-Beta)")
+        self.board = Board()
+        self.tables = {BLACK: TranspositionTable(TT_SIZE_MB), WHITE: TranspositionTable(TT_SIZE_MB)}
+        self.orderer = MoveOrderer()
+        self.searchers = None
+        if SEARCH_WORKERS > 1:
+            self.searchers = {color: ParallelSearch(SEARCH_WORKERS, TT_SIZE_MB) for color in (BLACK, WHITE)}
+        self.worker = BackgroundSearch(self.root)
+        self.book = load_book()
+        self.current_player = BLACK
+        self.first_move_done = False
+        self.game_over = False
+
+        # Setup UI
+        self.setup_ui()
+
+        # Start the game
+        self.next_turn = self.root.after(500, self.play_turn)
+
+    def setup_ui(self):
+        # Create a frame for controls
+        control_frame = tk.Frame(self.root)
+        control_frame.pack(pady=10)
+
+        # Status label
+        self.status_label = tk.Label(control_frame, text="Starting game...", font=('Arial', 12))
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        # Reset button
+        self.reset_button = tk.Button(control_frame, text="Reset Game", command=self.reset_game)
+        self.reset_button.pack(side=tk.LEFT, padx=10)
+
+        # Create canvas for the board
+        self.canvas = tk.Canvas(self.root,
+                                width=BOARD_SIZE * CELL_SIZE,
+                                height=BOARD_SIZE * CELL_SIZE,
+                                bg='bisque')
+        self.canvas.pack(pady=10)
+
+        # Draw the board
+        self.draw_board()
+
+    def draw_board(self):
+        """Draw the grid lines once; stones are added one at a time by draw_stone()"""
+        for i in range(BOARD_SIZE):
+            # Horizontal lines
+            self.canvas.create_line(0, i * CELL_SIZE,
+                                    BOARD_SIZE * CELL_SIZE, i * CELL_SIZE, tags="grid")
+            # Vertical lines
+            self.canvas.create_line(i * CELL_SIZE, 0,
+                                    i * CELL_SIZE, BOARD_SIZE * CELL_SIZE, tags="grid")
+
+    def draw_stone(self, idx, color):
+        """Add one stone and move the last-move marker onto it"""
+        i, j = divmod(idx, BOARD_SIZE)
+        x1 = j * CELL_SIZE + 5
+        y1 = i * CELL_SIZE + 5
+        x2 = (j + 1) * CELL_SIZE - 5
+        y2 = (i + 1) * CELL_SIZE - 5
+        self.canvas.create_oval(x1, y1, x2, y2, fill=NAMES[color], outline='black', tags="stone")
+        self.canvas.delete("last")
+        x = (x1 + x2) // 2
+        y = (y1 + y2) // 2
+        self.canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill='red', outline='', tags=("stone", "last"))
+
+    def play_turn(self):
+        if self.game_over:
+            return
+
+        if self.board.is_terminal():
+            winner = self.board.winner()
+            if winner != EMPTY:
+                message = f"{NAMES[winner].capitalize()} wins!"
+                self.status_label.config(text=message)
+                self.game_over = True
+            else:
+                message = "It's a draw!"
+                self.status_label.config(text=message)
+                self.game_over = True
+            return
+
+        start_time = time.time()
+
+        if not self.first_move_done:
+            # Random first move
+            empty_indices = self.board.empty_indices()
+            if empty_indices:
+                idx = random.choice(empty_indices)
+                self.board.place(idx, self.current_player)
+                self.first_move_done = True
+                self.draw_stone(idx, self.current_player)
+                self.status_label.config(text=f"Random first move by {NAMES[self.current_player]}")
+                print(f"{NAMES[self.current_player]} (random) moved in {time.time() - start_time:.2f}s")
+                self.current_player = other_player(self.current_player)
+                self.next_turn = self.root.after(500, self.play_turn)
+            else:
+                print("Error: No valid moves left for random selection.")
+            return
+        else:
+            # Opening book moves are played without searching
+            idx = self.book.lookup(self.board, self.current_player) if self.book else None
+            if idx is not None:
+                self.finish_turn((idx, None, None), start_time)
+                return
+
+            # AI turn, searched on a worker thread so the window stays responsive
+            player = self.current_player
+            board = self.board.copy()
+            if player == BLACK:
+                self.status_label.config(text="Alpha-Beta (Black) thinking...")
+                engine, table, orderer = 'alphabeta', self.tables[BLACK], self.orderer
+            else:
+                self.status_label.config(text="Minimax (White) thinking...")
+                engine, table, orderer = 'minimax', self.tables[WHITE], None
+            searcher = self.searchers[player] if self.searchers else None
+
+            def search(cancel):
+                stats = SearchStats(timing=True)
+                if searcher:
+                    result = searcher.iterative_deepening(board, player, MOVE_TIME, engine, cancel=cancel,
+                                                          stats=stats)
+                else:
+                    result = iterative_deepening(board, player, MOVE_TIME, engine, table, orderer=orderer,
+                                                 cancel=cancel, stats=stats)
+                return result + (stats,)
+
+            self.worker.start(search, lambda result: self.finish_turn(result, start_time))
+
+    def finish_turn(self, result, start_time):
+        idx, depth, stats = result
+        if idx is not None:
+            self.board.place(idx, self.current_player)
+            self.draw_stone(idx, self.current_player)
+            # Keep alpha-beta's killers at the plies of the game they were found at
+            self.orderer.advance()
+        else:
+            print("Error: AI returned an invalid state!")
+
+        seconds = time.time() - start_time
+        if stats is None:
+            print(f"{NAMES[self.current_player]} moved in {seconds:.2f}s (book move)")
+        else:
+            self.report(stats, depth, seconds)
+        self.current_player = other_player(self.current_player)
+        self.next_turn = self.root.after(500, self.play_turn)
+
+    def report(self, stats, depth, seconds):
+        """Print the search stats of the move just played, and log them to STATS_LOG."""
+        if stats.prepass is not None:
+            print(f"{NAMES[self.current_player]} moved in {seconds:.2f}s ({stats.prepass} pre-pass, no search)")
+        else:
+            print(f"{NAMES[self.current_player]} moved in {seconds:.2f}s (depth {depth}, {stats.nodes} nodes, "
+                  f"{stats.nps(seconds):.0f} nps, branching factor {stats.branching_factor():.1f})")
+            print(f"  nodes per ply: {stats.plies()}")
+            print(f"  TT hit rate {stats.tt_hit_rate():.0%}, {stats.terminal_checks} terminal checks, "
+                  f"{stats.evaluations} evaluations")
+            if self.current_player == BLACK:
+                print(f"  alpha-beta cutoffs: {stats.cutoffs}, first-move cutoff rate {stats.first_cutoff_rate():.0%}")
+            split = ", ".join(f"{section} {spent:.2f}s" for section, spent in stats.seconds.items())
+            print(f"  time: {split}")
+        if STATS_LOG:
+            record = {'move': self.board.count, 'player': NAMES[self.current_player], 'seconds': seconds,
+                      'depth': depth, **stats.to_dict()}
+            with open(STATS_LOG, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def reset_game(self):
+        """Reset the game to initial state"""
+        # Drop the pending turn and stop the search in progress, if any
+        self.root.after_cancel(self.next_turn)
+        self.worker.cancel()
+        self.board = Board()
+        self.tables = {BLACK: TranspositionTable(TT_SIZE_MB), WHITE: TranspositionTable(TT_SIZE_MB)}
+        self.orderer = MoveOrderer()
+        if self.searchers:
+            for searcher in self.searchers.values():
+                searcher.clear()
+        self.current_player = BLACK
+        self.first_move_done = False
+        self.game_over = False
+        self.status_label.config(text="Starting new game...")
+        self.canvas.delete("stone")
+        self.next_turn = self.root.after(500, self.play_turn)
+
+    def close(self):
+        """Stop the game's searches, timers and worker processes before its window or frame is destroyed."""
+        self.root.after_cancel(self.next_turn)
+        self.worker.cancel()
+        if self.searchers:
+            for searcher in self.searchers.values():
+                searcher.close()
+
+
+if __name__ == '__main__':
+    root = tk.Tk()
+    app = GomokuGUI(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""Headless AI-vs-AI tournament runner.
+
+Plays N games between two engines across a process pool, streams one
+JSON line per game to a results file and prints the score, win rate,
+Elo difference and time per move.
+
+An engine is given as ENGINE:DEPTH for a fixed-depth search or
+ENGINE@SECONDS for iterative deepening with a time limit, e.g.
+
+    python tournament.py alphabeta:3 minimax:2 --games 200 --out results.jsonl
+
+Games are played in pairs from the same random opening with the colours
+swapped, so neither engine gains from a lucky opening.
+
+Results go to AiVsAi/tournament.jsonl, which git ignores, unless --out
+names another file.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import (BLACK, CELLS, EMPTY, NAMES, WHITE, Board, MoveOrderer, TranspositionTable, alphabeta,
+                    iterative_deepening, minimax, other_player, pvs)
+
+TT_SIZE_MB = 16
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tournament.jsonl')  # gitignored
+ENGINES = ('alphabeta', 'minimax', 'pvs')
+
+
+def parse_engine(spec):
+    """'alphabeta:3' -> ('alphabeta', 3, None); 'minimax@0.5' -> ('minimax', None, 0.5)."""
+    try:
+        if '@' in spec:
+            name, limit = spec.split('@')
+            depth, seconds = None, float(limit)
+        else:
+            name, limit = spec.split(':')
+            depth, seconds = int(limit), None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ENGINE:DEPTH or ENGINE@SECONDS, got {spec!r}")
+    if name not in ENGINES:
+        raise argparse.ArgumentTypeError(f"unknown engine {name!r}, choose from {', '.join(ENGINES)}")
+    return name, depth, seconds
+
+
+def positive_int(text):
+    """argparse type for a count of at least one."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected at least 1, got {value}")
+    return value
+
+
+def engine_spec(spec):
+    """argparse type that checks an engine spec but keeps it as text."""
+    parse_engine(spec)
+    return spec
+
+
+class Player:
+    """One engine with its own table and orderer for the length of a game."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.engine, self.depth, self.seconds = parse_engine(spec)
+        self.table = TranspositionTable(TT_SIZE_MB)
+        self.orderer = MoveOrderer()
+        self.time = 0.0
+        self.moves = 0
+
+    def move(self, board, color):
+        start = time.perf_counter()
+        if self.seconds is not None:
+            idx, _ = iterative_deepening(board, color, self.seconds, self.engine, self.table, orderer=self.orderer)
+        elif self.engine == 'minimax':
+            _, idx = minimax(board, self.depth, color, color, table=self.table)
+        elif self.engine == 'pvs':
+            idx = pvs(board, -math.inf, math.inf, color, self.depth, self.table, orderer=self.orderer)
+        else:
+            idx = alphabeta(board, -math.inf, math.inf, color, self.depth, self.table, orderer=self.orderer)
+        # This move and the reply are played before the next search
+        self.orderer.advance(2)
+        self.time += time.perf_counter() - start
+        self.moves += 1
+        return idx
+
+
+def random_opening(seed, plies):
+    """`plies` random stones: the first anywhere, as AiVsAi opens, the rest next to a stone."""
+    rng = random.Random(seed)
+    board = Board()
+    opening = []
+    color = BLACK
+    for _ in range(plies):
+        idx = rng.choice(list(board.candidates()) if opening else range(CELLS))
+        board.place(idx, color)
+        opening.append(idx)
+        color = other_player(color)
+    return opening
+
+
+def play_game(game, spec_a, spec_b, a_is_black, opening):
+    """Play one game from `opening` and return its result record."""
+    players = {BLACK: Player(spec_a), WHITE: Player(spec_b)}
+    if not a_is_black:
+        players = {BLACK: players[WHITE], WHITE: players[BLACK]}
+    board = Board()
+    color = BLACK
+    moves = []
+    for idx in opening:
+        board.place(idx, color)
+        color = other_player(color)
+    while not board.is_terminal():
+        idx = players[color].move(board, color)
+        board.place(idx, color)
+        moves.append(idx)
+        color = other_player(color)
+
+    winner = board.winner()
+    a_color = BLACK if a_is_black else WHITE
+    if winner == EMPTY:
+        score = 0.5
+    else:
+        score = 1.0 if winner == a_color else 0.0
+    return {
+        'game': game,
+        'black': players[BLACK].spec,
+        'white': players[WHITE].spec,
+        'a': NAMES[a_color],
+        'opening': opening,
+        'moves': moves,
+        'winner': NAMES[winner] if winner != EMPTY else 'draw',
+        'score_a': score,
+        'time': {NAMES[c]: players[c].time for c in (BLACK, WHITE)},
+        'searched_moves': {NAMES[c]: players[c].moves for c in (BLACK, WHITE)},
+    }
+
+
+def elo(score):
+    """Elo difference matching an expected score in (0, 1)."""
+    return -400 * math.log10(1 / score - 1)
+
+
+def wilson(score, n, z=1.96):
+    """Wilson score interval around a mean score of n games, as (low, high)."""
+    centre = (score + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z / (1 + z * z / n) * math.sqrt(score * (1 - score) / n + z * z / (4 * n * n))
+    return centre - margin, centre + margin
+
+
+def summarize(results):
+    """Score, win rate, Elo difference with a 95% interval and time per move of A against B.
+
+    The interval is a Wilson interval on the score, so it keeps a width
+    even when every game ended the same way. time_per_move is keyed 'a'
+    and 'b', so an engine can play itself.
+    """
+    n = len(results)
+    if not n:
+        raise ValueError("no games to summarize")
+    scores = [r['score_a'] for r in results]
+    mean = sum(scores) / n
+    wins = scores.count(1.0)
+    draws = scores.count(0.5)
+    low, high = wilson(mean, n)
+    clip = 0.5 / n  # keeps a clean sweep from meaning infinite Elo
+
+    def bounded(s):
+        return elo(min(max(s, clip), 1 - clip))
+
+    time_per_move = {}
+    for side in ('a', 'b'):
+        total = moves = 0
+        for r in results:
+            color = r['a'] if side == 'a' else ('white' if r['a'] == 'black' else 'black')
+            total += r['time'][color]
+            moves += r['searched_moves'][color]
+        time_per_move[side] = total / moves if moves else 0.0
+    return {
+        'games': n,
+        'wins': wins,
+        'draws': draws,
+        'losses': n - wins - draws,
+        'score': mean,
+        'win_rate': wins / n,
+        'elo': bounded(mean),
+        'elo_low': bounded(low),
+        'elo_high': bounded(high),
+        'time_per_move': time_per_move,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a headless AI-vs-AI match.")
+    parser.add_argument('engine_a', type=engine_spec, help="ENGINE:DEPTH or ENGINE@SECONDS")
+    parser.add_argument('engine_b', type=engine_spec, help="ENGINE:DEPTH or ENGINE@SECONDS")
+    parser.add_argument('--games', type=positive_int, default=100)
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count() or 1)
+    parser.add_argument('--opening-plies', type=int, default=2, help="random stones before the engines play")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=RESULTS, help="JSONL file the games are appended to")
+    args = parser.parse_args()
+
+    results = []
+    start = time.time()
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as pool, open(args.out, 'a') as out:
+        futures = []
+        for game in range(args.games):
+            # Pairs of games share an opening with the colours swapped
+            opening = random_opening(args.seed + game // 2, args.opening_plies)
+            futures.append(pool.submit(play_game, game, args.engine_a, args.engine_b, game % 2 == 0, opening))
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            results.append(result)
+            outcome = "draw" if result['winner'] == 'draw' else f"{result['winner']} wins"
+            print(f"game {result['game']}: {result['black']} (black) vs {result['white']} (white), {outcome}")
+
+    summary = summarize(results)
+    print(f"\n{args.engine_a} vs {args.engine_b}: +{summary['wins']} ={summary['draws']} -{summary['losses']} "
+          f"in {summary['games']} games ({time.time() - start:.0f}s)")
+    print(f"score {summary['score']:.1%}, win rate {summary['win_rate']:.1%}, "
+          f"Elo {summary['elo']:+.0f} [{summary['elo_low']:+.0f}, {summary['elo_high']:+.0f}]")
+    for side, spec in (('a', args.engine_a), ('b', args.engine_b)):
+        print(f"  {spec}: {summary['time_per_move'][side] * 1000:.1f} ms per move")
+
+
+if __name__ == '__main__':
+    main()
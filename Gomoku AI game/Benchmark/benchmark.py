@@ -0,0 +1,169 @@
+"""Engine benchmark over a fixed corpus of positions.
+
+Runs every engine on every position of positions.json twice: once at a
+fixed depth and once with iterative deepening under a fixed time limit.
+For each run it records the move, the nodes searched, nodes per second
+and, for the timed run, the depth reached and when each depth finished.
+The timed run skips the tactical pre-pass, so it always measures the
+search itself.
+pvs searches the same depth as alphabeta and must choose the same moves;
+any position where they differ is listed.
+The full SearchStats of each fixed-depth run are saved with --save.
+
+    python benchmark.py --save baseline.json
+    ... change the engine ...
+    python benchmark.py --baseline baseline.json
+
+Against a baseline, a fixed-depth run that is slower by more than
+--threshold counts as a regression and the exit status is 1. Changed
+node counts and moves are listed too: they mean the search itself
+changed, not just its speed. Timings depend on the machine, so save the
+baseline on the machine the comparison runs on.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import (BITS, BLACK, BOARD_SIZE, COLORS, WHITE, Board, SearchStats, alphabeta, iterative_deepening,
+                    minimax, pvs)
+
+POSITIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'positions.json')
+MOVE_TIME = 1.0  # seconds for the fixed-time runs
+THRESHOLD = 0.10
+
+# Fixed-depth search of each engine: (board, player, depth, stats) -> move
+SEARCHES = {
+    'minimax': lambda board, player, depth, stats: minimax(board, depth, player, player, stats=stats)[1],
+    'alphabeta': lambda board, player, depth, stats: alphabeta(board, -math.inf, math.inf, player, depth,
+                                                               stats=stats),
+    'pvs': lambda board, player, depth, stats: pvs(board, -math.inf, math.inf, player, depth, stats=stats),
+}
+DEPTHS = {'minimax': 3, 'alphabeta': 4, 'pvs': 4}
+
+CELL_COLORS = {'x': BLACK, 'o': WHITE}
+
+
+def load_positions(path=POSITIONS):
+    """[(name, category, board, player)] from a corpus file of 'x'/'o'/'.' rows."""
+    positions = []
+    with open(path) as f:
+        for entry in json.load(f):
+            stones = [0, 0, 0]
+            for r, row in enumerate(entry['board']):
+                for c, cell in enumerate(row):
+                    if cell in CELL_COLORS:
+                        stones[CELL_COLORS[cell]] |= BITS[r * BOARD_SIZE + c]
+            board = Board(stones[BLACK], stones[WHITE])
+            positions.append((entry['name'], entry['category'], board, COLORS[entry['to_move']]))
+    return positions
+
+
+def run_depth(engine, board, player, repeat):
+    """Fixed-depth run; the fastest of `repeat` runs is kept."""
+    best = None
+    for _ in range(repeat):
+        stats = SearchStats()
+        start = time.perf_counter()
+        move = SEARCHES[engine](board.copy(), player, DEPTHS[engine], stats)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best['seconds']:
+            best = {'depth': DEPTHS[engine], 'move': move, 'nodes': stats.nodes, 'seconds': seconds,
+                    'nps': stats.nps(seconds), 'stats': stats.to_dict()}
+    return best
+
+
+def run_time(engine, board, player, time_limit):
+    stats = SearchStats()
+    start = time.perf_counter()
+    # Without the tactical pre-pass, which answers most tactical positions before any search
+    move, depth = iterative_deepening(board, player, time_limit, engine, stats=stats, threats=False)
+    seconds = time.perf_counter() - start
+    return {'move': move, 'depth': depth, 'nodes': stats.nodes, 'seconds': seconds, 'nps': stats.nps(seconds),
+            'depth_times': stats.depth_times}
+
+
+def run(engines, time_limit, repeat):
+    results = {'engines': {}, 'positions': {}}
+    for name, category, board, player in load_positions():
+        row = results['positions'][name] = {'category': category}
+        for engine in engines:
+            row[engine] = {'depth': run_depth(engine, board, player, repeat),
+                           'time': run_time(engine, board, player, time_limit)}
+            fixed, timed = row[engine]['depth'], row[engine]['time']
+            print(f"{name:12} {engine:10} depth {fixed['depth']}: move {fixed['move']:3} {fixed['nodes']:8} nodes "
+                  f"{fixed['seconds']:7.3f}s {fixed['nps']:8.0f} nps | {time_limit:g}s: depth {timed['depth']} "
+                  f"move {timed['move']:3} {timed['nps']:8.0f} nps")
+    for engine in engines:
+        runs = [row[engine]['depth'] for row in results['positions'].values()]
+        timed = [row[engine]['time'] for row in results['positions'].values()]
+        nodes = sum(r['nodes'] for r in runs)
+        seconds = sum(r['seconds'] for r in runs)
+        results['engines'][engine] = {'nodes': nodes, 'seconds': seconds, 'nps': nodes / seconds if seconds else 0.0,
+                                      'mean_depth': sum(r['depth'] for r in timed) / len(timed)}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the differences from `baseline`; return True if any engine regressed."""
+    regressed = False
+    for engine, total in results['engines'].items():
+        base = baseline['engines'].get(engine)
+        if base is None:
+            print(f"{engine}: not in the baseline")
+            continue
+        change = total['seconds'] / base['seconds'] - 1 if base['seconds'] else 0.0
+        status = "REGRESSION" if change > threshold else "ok"
+        regressed |= change > threshold
+        print(f"{engine}: fixed-depth time {base['seconds']:.3f}s -> {total['seconds']:.3f}s ({change:+.1%}), "
+              f"nps {base['nps']:.0f} -> {total['nps']:.0f}, mean timed depth {base['mean_depth']:.2f} -> "
+              f"{total['mean_depth']:.2f}  {status}")
+        for name, row in results['positions'].items():
+            old = baseline['positions'].get(name, {}).get(engine)
+            if old is None:
+                continue
+            new = row[engine]['depth']
+            if new['nodes'] != old['depth']['nodes'] or new['move'] != old['depth']['move']:
+                print(f"  {name}: nodes {old['depth']['nodes']} -> {new['nodes']}, "
+                      f"move {old['depth']['move']} -> {new['move']}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engines on a fixed set of positions.")
+    parser.add_argument('--engines', nargs='+', choices=sorted(SEARCHES), default=sorted(SEARCHES))
+    parser.add_argument('--time', type=float, default=MOVE_TIME, help="seconds per timed run")
+    parser.add_argument('--repeat', type=int, default=3, help="fixed-depth runs per position, fastest kept")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare with results saved by --save")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="slowdown counted as a regression")
+    args = parser.parse_args()
+
+    results = run(args.engines, args.time, args.repeat)
+    print()
+    for engine, total in results['engines'].items():
+        print(f"{engine}: {total['nodes']} nodes in {total['seconds']:.3f}s ({total['nps']:.0f} nps), "
+              f"mean depth {total['mean_depth']:.2f} in {args.time:g}s")
+    if {'alphabeta', 'pvs'} <= results['engines'].keys():
+        # Same depth, so a different move means the scout searches changed the result
+        differ = [name for name, row in results['positions'].items()
+                  if row['pvs']['depth']['move'] != row['alphabeta']['depth']['move']]
+        print(f"pvs and alphabeta differ on {len(differ)} positions {' '.join(differ)}")
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
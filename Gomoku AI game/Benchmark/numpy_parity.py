@@ -0,0 +1,52 @@
+"""Check the NumPy evaluation backend against the pure-Python one.
+
+Scores seeded random boards with heuristic(), evaluate_board() and the
+*_children() functions of both backends and lists the boards where any
+score differs; the exit status is 1 if there are any.
+
+    python numpy_parity.py --boards 500 --seed 1
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import BITS, BLACK, CELLS, WHITE, Board, other_player
+from engine import numpy_eval
+
+MAX_STONES = 150
+
+
+def random_boards(count, seed):
+    """`count` boards of 0 to MAX_STONES stones, the colours alternating."""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        stones = [0, 0, 0]
+        color = rng.choice((BLACK, WHITE))
+        for idx in rng.sample(range(CELLS), rng.randint(0, MAX_STONES)):
+            stones[color] |= BITS[idx]
+            color = other_player(color)
+        boards.append(Board(stones[BLACK], stones[WHITE]))
+    return boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the NumPy backend against engine.evaluation.")
+    parser.add_argument('--boards', type=int, default=200, help="random boards to compare")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if not numpy_eval.AVAILABLE:
+        sys.exit("NumPy is not installed")
+    mismatches = numpy_eval.check_parity(random_boards(args.boards, args.seed))
+    for board in mismatches:
+        print(f"differs: black {board.stones[BLACK]:#x} white {board.stones[WHITE]:#x}")
+    print(f"{len(mismatches)} of {args.boards} boards differ")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
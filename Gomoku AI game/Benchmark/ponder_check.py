@@ -0,0 +1,63 @@
+"""Check pondering on positions where the search plays outside board.candidates().
+
+The tactical pre-pass of iterative_deepening() can return a four two
+cells from every stone or the first move of a threat-space win, neither
+of which is a candidate; likely_moves() must still rank it first and
+ponder() must run. The exit status is 1 if any position fails.
+
+    python ponder_check.py --time 0.5
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import BITS, BLACK, BOARD_SIZE, WHITE, Board, other_player, ponder
+from engine.ponder import likely_moves
+
+# (name, black stones, white stones, player to move, expected first move), as (row, col)
+POSITIONS = [
+    ("distant four", [(7, 4), (7, 5), (7, 6), (3, 8), (4, 8), (5, 8)],
+     [(7, 3), (2, 8), (14, 14), (14, 12), (12, 14), (0, 14)], BLACK, (7, 8)),
+]
+
+
+def make_board(black, white):
+    stones = [0, 0, 0]
+    for color, cells in ((BLACK, black), (WHITE, white)):
+        for row, col in cells:
+            stones[color] |= BITS[row * BOARD_SIZE + col]
+    return Board(stones[BLACK], stones[WHITE])
+
+
+def check(name, board, player, expected, time_limit):
+    """An error message, or None if the position passes."""
+    want = expected[0] * BOARD_SIZE + expected[1]
+    try:
+        moves = likely_moves(board, player, 3, time_limit=time_limit)
+        ponder(board, other_player(player), time_limit)
+    except Exception as exc:
+        return f"{name}: {type(exc).__name__}: {exc}"
+    if not moves or moves[0] != want:
+        return f"{name}: likely_moves() put {[divmod(idx, BOARD_SIZE) for idx in moves]} before {expected}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check likely_moves() and ponder() on pre-pass positions.")
+    parser.add_argument('--time', type=float, default=0.5, help="seconds per search")
+    args = parser.parse_args()
+    failures = []
+    for name, black, white, player, expected in POSITIONS:
+        error = check(name, make_board(black, white), player, expected, args.time)
+        if error:
+            failures.append(error)
+            print(error)
+    print(f"{len(failures)} of {len(POSITIONS)} positions fail")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
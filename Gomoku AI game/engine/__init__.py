@@ -0,0 +1,16 @@
+"""Shared Gomoku engine used by every front-end."""
+
+from .background import BackgroundSearch, EnginePlayer
+from .board import (BITS, BLACK, BOARD_SIZE, CELLS, COLORS, EMPTY, NAMES, WHITE, WIN_COUNT,
+                    Board, other_player)
+from .evaluation import LineEvaluator, WindowEvaluator, evaluate_board, heuristic
+from .ordering import MoveOrderer
+from .parallel import ParallelSearch
+from .ponder import ponder
+from .position import Position
+from .search import (SearchTimeout, alphabeta, alphabeta_search, evaluation_backend, iterative_deepening,
+                     minimax, pvs)
+from .session import Session
+from .stats import SearchStats
+from .threats import find_forced_win, immediate_move, vcf, vct
+from .transposition import TranspositionTable
@@ -0,0 +1,132 @@
+"""Run searches on a worker thread and hand the results back to a Tk loop.
+
+Tk may only be used from the thread running mainloop(), so the worker
+never touches the GUI: it stores its result, and the Tk loop picks it up
+by polling with after().
+
+EnginePlayer builds on it to let the engine play one side of a GUI game:
+opening book, ponder hits, the move search and pondering.
+"""
+
+import threading
+
+from .ponder import ponder
+from .search import iterative_deepening
+
+POLL_MS = 50
+
+
+class BackgroundSearch:
+    """At most one live search at a time, run off the Tk thread.
+
+    `root` is any Tk widget; only its after() method is used.
+    """
+
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.thread = None
+        self.cancel_event = None
+        self.poll_id = None  # after() id of the pending poll
+
+    def start(self, search, on_done):
+        """Run search(cancel) on a worker thread, then call on_done(result) on the Tk thread.
+
+        `search` must pass the `cancel` event on to the engine so that
+        cancel() can stop it. A search that is still running is
+        cancelled and waited for first, so two searches never share
+        tables or orderers.
+        """
+        self.stop()
+        cancel = threading.Event()
+        result = []
+        self.cancel_event = cancel
+        self.thread = threading.Thread(target=lambda: result.append(search(cancel)), daemon=True)
+        self.thread.start()
+        self.poll_id = self.root.after(self.poll_ms, self._poll, self.thread, cancel, result, on_done)
+
+    def _poll(self, thread, cancel, result, on_done):
+        self.poll_id = None
+        if thread.is_alive():
+            self.poll_id = self.root.after(self.poll_ms, self._poll, thread, cancel, result, on_done)
+        elif not cancel.is_set() and result:
+            on_done(result[0])
+
+    def cancel(self):
+        """Stop the current search; its on_done callback will not be called.
+
+        Also drops the pending poll, so the widget can be destroyed
+        without after() calling into it.
+        """
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+
+    def stop(self):
+        """Cancel the current search and wait until its thread has finished."""
+        self.cancel()
+        if self.thread is not None:
+            self.thread.join()
+
+
+class EnginePlayer:
+    """The engine's side of one GUI game.
+
+    move() answers from the opening book, then from a ponder hit (a reply
+    already searched in full while the opponent thought), and searches on
+    a worker thread only when neither has the position. pondering() then
+    searches replies to the opponent's likely moves on a second thread
+    until stop_pondering(). `book` is an engine.book.OpeningBook or None.
+    """
+
+    def __init__(self, root, time_limit, book=None):
+        self.root = root
+        self.time_limit = time_limit
+        self.book = book
+        self.searcher = BackgroundSearch(root)
+        self.ponderer = BackgroundSearch(root)
+        self.replies = {}
+        self.next_move = None  # pending after() call that continues the game
+
+    def after(self, ms, callback):
+        """Schedule the next step of the game, so cancel() can drop it."""
+        self.next_move = self.root.after(ms, callback)
+
+    def move(self, board, player, engine, table, on_done):
+        """Find `player`'s move on `board`, then call on_done(index or None) on the Tk thread."""
+        reply = self.book.lookup(board, player) if self.book else None
+        if reply is None:
+            reply = self.replies.get(board.key(player))
+        if reply is not None:
+            on_done(reply)
+            return
+
+        # Runs on the worker thread, so it must not touch any Tk state
+        def search(cancel):
+            return iterative_deepening(board, player, self.time_limit, engine, table, cancel=cancel)[0]
+
+        self.searcher.start(search, on_done)
+
+    def pondering(self, board, player, engine, table):
+        """Search `player`'s replies to the opponent's likely moves until stop_pondering()."""
+        replies = self.replies = {}
+
+        def search(cancel):
+            return ponder(board, player, self.time_limit, engine, table, replies, cancel=cancel)
+
+        self.ponderer.start(search, lambda replies: None)
+
+    def stop_pondering(self):
+        """Stop pondering once the opponent has moved; its replies and table entries are kept for move()."""
+        self.ponderer.stop()
+
+    def cancel(self):
+        """Drop the pending step, the searches and the ponder replies, e.g. for a new game or on close."""
+        if self.next_move is not None:
+            self.root.after_cancel(self.next_move)
+            self.next_move = None
+        self.searcher.cancel()
+        self.ponderer.cancel()
+        self.replies = {}
@@ -0,0 +1,216 @@
+"""Bitboard representation of the 15x15 Gomoku board.
+
+Each colour is one Python int. Rows are stored STRIDE bits apart so the
+spare bit at the end of every row acts as a guard column: shifting a
+bitboard along any of the four line directions never wraps a stone onto
+the next row.
+"""
+
+import functools
+import random
+
+BOARD_SIZE = 15
+WIN_COUNT = 5
+CELLS = BOARD_SIZE * BOARD_SIZE
+
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+COLORS = {'black': BLACK, 'white': WHITE}
+NAMES = {EMPTY: '-', BLACK: 'black', WHITE: 'white'}
+
+STRIDE = BOARD_SIZE + 1
+DIRECTIONS = (1, STRIDE, STRIDE + 1, STRIDE - 1)  # → ↓ ↘ ↙
+
+# BITS[idx] is the bitboard mask of flat board index idx (row * 15 + col)
+BITS = tuple(1 << (i // BOARD_SIZE * STRIDE + i % BOARD_SIZE) for i in range(CELLS))
+FULL = sum(BITS)
+INDEX = {b.bit_length() - 1: i for i, b in enumerate(BITS)}
+
+# Zobrist keys: ZOBRIST[color][idx] for stones and SIDE[color] for the side
+# to move. The seed is fixed so hashes are stable from one run to the next.
+_rng = random.Random(0x60D0)
+ZOBRIST = ((0,) * CELLS,
+           tuple(_rng.getrandbits(64) for _ in range(CELLS)),
+           tuple(_rng.getrandbits(64) for _ in range(CELLS)))
+SIDE = (0, _rng.getrandbits(64), _rng.getrandbits(64))
+
+
+def other_player(color):
+    return BLACK + WHITE - color
+
+
+def has_five(bits):
+    for s in DIRECTIONS:
+        m = bits & (bits >> s)
+        m &= m >> (2 * s)
+        if m & (bits >> (4 * s)):
+            return True
+    return False
+
+
+def dilate(bits, radius):
+    """Grow every set bit into the square of cells within `radius` of it."""
+    for _ in range(radius):
+        bits = (bits | (bits << 1) | (bits >> 1)) & FULL
+        bits = (bits | (bits << STRIDE) | (bits >> STRIDE)) & FULL
+    return bits
+
+
+@functools.lru_cache(maxsize=None)
+def neighborhoods(radius):
+    """Mask of the cells within `radius` of each index."""
+    return tuple(dilate(bit, radius) for bit in BITS)
+
+
+def iter_indices(bits):
+    """Yield the board indices of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield INDEX[low.bit_length() - 1]
+        bits ^= low
+
+
+class Board:
+    """Stones, stone count, Zobrist hash and candidate moves of a position.
+
+    Candidate moves are the empty cells within `radius` of a stone. Their
+    mask is kept on a stack that place() pushes and undo() pops, so undo()
+    must take back the most recent place().
+
+    Incremental evaluators added with attach() are told about every
+    place() and undo() and are copied along with the board.
+    """
+
+    __slots__ = ('stones', 'count', 'hash', 'radius', 'near', '_neighborhood', 'evaluators')
+
+    def __init__(self, black=0, white=0, radius=1):
+        self.stones = [0, black, white]
+        self.count = (black | white).bit_count()
+        self.hash = 0
+        for color in (BLACK, WHITE):
+            for idx in iter_indices(self.stones[color]):
+                self.hash ^= ZOBRIST[color][idx]
+        self.set_radius(radius)
+        self.evaluators = []
+
+    def set_radius(self, radius):
+        self.radius = radius
+        self._neighborhood = neighborhoods(radius)
+        self.near = [dilate(self.occupied(), radius)]
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.stones = self.stones[:]
+        board.count = self.count
+        board.hash = self.hash
+        board.radius = self.radius
+        board._neighborhood = self._neighborhood
+        board.near = [self.near[-1]]
+        board.evaluators = [evaluator.copy() for evaluator in self.evaluators]
+        return board
+
+    def attach(self, kind):
+        """Return the attached evaluator of class `kind`, attaching a new one if needed."""
+        for evaluator in self.evaluators:
+            if type(evaluator) is kind:
+                return evaluator
+        evaluator = kind(self)
+        self.evaluators.append(evaluator)
+        return evaluator
+
+    def get(self, idx):
+        bit = BITS[idx]
+        if self.stones[BLACK] & bit:
+            return BLACK
+        if self.stones[WHITE] & bit:
+            return WHITE
+        return EMPTY
+
+    def place(self, idx, color):
+        self.stones[color] |= BITS[idx]
+        self.count += 1
+        self.hash ^= ZOBRIST[color][idx]
+        self.near.append(self.near[-1] | self._neighborhood[idx])
+        for evaluator in self.evaluators:
+            evaluator.place(idx, color)
+
+    def undo(self, idx, color):
+        """Take back the stone placed by the most recent place()."""
+        self.stones[color] ^= BITS[idx]
+        self.count -= 1
+        self.hash ^= ZOBRIST[color][idx]
+        self.near.pop()
+        for evaluator in self.evaluators:
+            evaluator.remove(idx, color)
+
+    def key(self, player):
+        """Transposition key of the position with `player` to move."""
+        return self.hash ^ SIDE[player]
+
+    def occupied(self):
+        return self.stones[BLACK] | self.stones[WHITE]
+
+    def is_empty(self, idx):
+        return not self.occupied() & BITS[idx]
+
+    def empty_mask(self):
+        return FULL & ~self.occupied()
+
+    def moves(self):
+        """Lazily yield every empty index.
+
+        The generator works on a snapshot, so the board may be changed
+        with place()/undo() while it is being consumed.
+        """
+        return iter_indices(self.empty_mask())
+
+    def empty_indices(self):
+        return list(self.moves())
+
+    def candidate_mask(self):
+        """Empty cells within `radius` of a stone, or every empty cell on an empty board."""
+        near = self.near[-1]
+        if not near:
+            return FULL
+        return near & ~self.occupied()
+
+    def candidates(self):
+        """Lazily yield the candidate moves; like moves(), safe to use while searching."""
+        return iter_indices(self.candidate_mask())
+
+    def wins_at(self, idx):
+        """True if the stone on idx is part of five; only the four lines through idx are walked."""
+        bit = BITS[idx]
+        bits = self.stones[BLACK] if self.stones[BLACK] & bit else self.stones[WHITE]
+        for s in DIRECTIONS:
+            count = 1
+            b = bit << s
+            while bits & b:
+                count += 1
+                b <<= s
+            b = bit >> s
+            while bits & b:
+                count += 1
+                b >>= s
+            if count >= WIN_COUNT:
+                return True
+        return False
+
+    def is_terminal_at(self, idx):
+        """Terminal test after a stone was placed on idx."""
+        return self.count == CELLS or self.wins_at(idx)
+
+    def winner(self):
+        if has_five(self.stones[BLACK]):
+            return BLACK
+        if has_five(self.stones[WHITE]):
+            return WHITE
+        return EMPTY
+
+    def is_full(self):
+        return self.count == CELLS
+
+    def is_terminal(self):
+        return self.winner() != EMPTY or self.is_full()
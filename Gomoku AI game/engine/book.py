@@ -0,0 +1,204 @@
+"""Opening book: a sorted binary file of position key -> move and score.
+
+Positions are stored once for all 8 symmetries of the board: a position
+is keyed by the smallest Zobrist key among its rotations and
+reflections, and its move is stored in that same orientation.
+
+The file is a header followed by fixed-size records sorted by key. It is
+read through mmap and searched with a binary search, so opening a book
+costs nothing however large it is and a lookup only touches a few pages.
+
+The module is not imported by the engine package, so it can be run to
+build a book:
+
+    python -m engine.book engine/opening_book.bin --plies 6 --depth 4
+"""
+
+import argparse
+import bisect
+import math
+import mmap
+import os
+import struct
+
+from .board import BLACK, BOARD_SIZE, CELLS, SIDE, WHITE, ZOBRIST, Board, iter_indices, other_player
+from .ponder import likely_moves
+from .search import alphabeta_search
+from .transposition import TranspositionTable
+
+MAGIC = b'GMKBOOK1'
+HEADER = struct.Struct('<8sI')  # magic, most stones of any stored position
+RECORD = struct.Struct('<QHi')  # canonical key, move in canonical orientation, score for the side to move
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+
+def _symmetries():
+    """For each of the 8 symmetries, the index every cell is mapped to."""
+    last = BOARD_SIZE - 1
+    maps = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = []
+            for idx in range(CELLS):
+                r, c = divmod(idx, BOARD_SIZE)
+                if flip:
+                    c = last - c
+                for _ in range(turns):
+                    r, c = c, last - r
+                perm.append(r * BOARD_SIZE + c)
+            maps.append(tuple(perm))
+    return tuple(maps)
+
+
+SYMMETRIES = _symmetries()
+INVERSES = tuple(tuple(perm.index(idx) for idx in range(CELLS)) for perm in SYMMETRIES)
+
+
+def canonical(board, player):
+    """(key, symmetry): the smallest key of the position over all symmetries, and the one giving it."""
+    stones = [(color, idx) for color in (BLACK, WHITE) for idx in iter_indices(board.stones[color])]
+    best = None
+    for sym, perm in enumerate(SYMMETRIES):
+        key = SIDE[player]
+        for color, idx in stones:
+            key ^= ZOBRIST[color][perm[idx]]
+        if best is None or key < best[0]:
+            best = (key, sym)
+    return best
+
+
+def write_book(path, entries):
+    """Write {canonical key: (canonical move, score, stones on the board)} to `path`."""
+    records = sorted(entries.items())
+    max_stones = max((stones for _, _, stones in entries.values()), default=0)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, max_stones))
+        for key, (move, score, _) in records:
+            f.write(RECORD.pack(key, move, score))
+
+
+class OpeningBook:
+    """Read-only view of a book file written by write_book()."""
+
+    def __init__(self, path=BOOK_PATH):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_stones = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.count = (len(self.map) - HEADER.size) // RECORD.size
+        # bisect over the mapped records without reading them all
+        self.keys = _Keys(self.map, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def probe(self, key):
+        """(canonical move, score) stored for a canonical key, or None."""
+        i = bisect.bisect_left(self.keys, key)
+        if i == self.count:
+            return None
+        found, move, score = RECORD.unpack_from(self.map, HEADER.size + i * RECORD.size)
+        if found != key:
+            return None
+        return move, score
+
+    def lookup(self, board, player):
+        """Book move for `player` on `board` as a board index, or None."""
+        if board.count > self.max_stones:
+            return None
+        key, sym = canonical(board, player)
+        entry = self.probe(key)
+        if entry is None:
+            return None
+        return INVERSES[sym][entry[0]]
+
+
+class _Keys:
+    """Sequence of the keys of a mapped book, for bisect."""
+
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return struct.unpack_from('<Q', self.data, HEADER.size + i * RECORD.size)[0]
+
+
+def load_book(path=BOOK_PATH):
+    """The book at `path`, or None if there is no book file."""
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def generate_book(plies, depth, width, table=None):
+    """Search the openings and return entries for write_book().
+
+    Starts from the empty board (answered with the centre) and from every
+    first move, as AiVsAi opens at random; from there the book move and
+    `width` of the other likeliest moves are followed for `plies` plies.
+    Each position gets the move and score of an alpha-beta search of
+    `depth`.
+    """
+    if table is None:
+        table = TranspositionTable()
+    centre = CELLS // 2
+    empty = Board()
+    entries = {canonical(empty, BLACK)[0]: (centre, 0, 0)}
+    frontier = []
+    for idx in range(CELLS):
+        board = Board()
+        board.place(idx, BLACK)
+        frontier.append(board)
+    player = WHITE
+    for _ in range(plies):
+        following = []
+        for board in frontier:
+            key, sym = canonical(board, player)
+            if key in entries:
+                continue
+            score, move = alphabeta_search(board.copy(), -math.inf, math.inf, player, depth, table)
+            if player != BLACK:
+                score = -score
+            entries[key] = (SYMMETRIES[sym][move], score, board.count)
+            # The book move first, so a game that follows the book stays in it
+            replies = [move] + [idx for idx in likely_moves(board, player, width + 1) if idx != move][:width]
+            for idx in replies:
+                child = board.copy()
+                child.place(idx, player)
+                if not child.is_terminal_at(idx):
+                    following.append(child)
+        frontier = following
+        player = other_player(player)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Gomoku opening book.")
+    parser.add_argument('path', nargs='?', default=BOOK_PATH)
+    parser.add_argument('--plies', type=int, default=6, help="plies searched after the first move")
+    parser.add_argument('--depth', type=int, default=4, help="alpha-beta depth per position")
+    parser.add_argument('--width', type=int, default=2, help="moves followed from each position besides the book move")
+    args = parser.parse_args()
+    entries = generate_book(args.plies, args.depth, args.width)
+    write_book(args.path, entries)
+    print(f"wrote {len(entries)} positions to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
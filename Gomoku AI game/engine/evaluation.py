@@ -0,0 +1,309 @@
+"""Static evaluation functions shared by the minimax and alpha-beta engines."""
+
+from .board import BITS, BLACK, BOARD_SIZE, CELLS, DIRECTIONS, FULL, WHITE, WIN_COUNT, iter_indices, other_player
+
+# Score of a 5-cell window holding n stones of one colour and none of the other
+WINDOW_SCORES = (0, 0, 10, 100, 1000, 100000)
+
+
+def _windows():
+    windows = []
+    for i in range(BOARD_SIZE):
+        for j in range(BOARD_SIZE):
+            if j + WIN_COUNT <= BOARD_SIZE:
+                windows.append([i * BOARD_SIZE + j + k for k in range(WIN_COUNT)])
+            if i + WIN_COUNT <= BOARD_SIZE:
+                windows.append([(i + k) * BOARD_SIZE + j for k in range(WIN_COUNT)])
+            if i + WIN_COUNT <= BOARD_SIZE and j + WIN_COUNT <= BOARD_SIZE:
+                windows.append([(i + k) * BOARD_SIZE + (j + k) for k in range(WIN_COUNT)])
+            if i + WIN_COUNT <= BOARD_SIZE and j - WIN_COUNT >= -1:
+                windows.append([(i + k) * BOARD_SIZE + (j - k) for k in range(WIN_COUNT)])
+    return windows
+
+
+# Every 5-cell window on the board as a list of indices, and as a bitboard mask
+WINDOWS = _windows()
+WINDOW_MASKS = [sum(BITS[idx] for idx in window) for window in WINDOWS]
+
+# CELL_WINDOWS[idx]: the (at most 20) windows that contain idx
+CELL_WINDOWS = tuple(tuple(w for w, window in enumerate(WINDOWS) if idx in window) for idx in range(CELLS))
+
+# A window's counts are encoded as 6 * black + white; WINDOW_VALUES maps the
+# code to the window's contribution to the score from black's side.
+WINDOW_ADD = (0, 6, 1)
+WINDOW_VALUES = tuple(
+    WINDOW_SCORES[b] if not w else -WINDOW_SCORES[w] if not b else 0
+    for b in range(WIN_COUNT + 1) for w in range(WIN_COUNT + 1)
+)
+
+
+def evaluate_board(board, player):
+    """Window score of the board from `player`'s point of view."""
+    own = board.stones[player]
+    opp = board.stones[other_player(player)]
+    score = 0
+    for mask in WINDOW_MASKS:
+        mine = own & mask
+        theirs = opp & mask
+        if mine:
+            if not theirs:
+                score += WINDOW_SCORES[mine.bit_count()]
+        elif theirs:
+            score -= WINDOW_SCORES[theirs.bit_count()]
+    return score
+
+
+def evaluate_children(board, moves, color):
+    """Black-side evaluate_board() after `color` plays each of `moves`."""
+    scores = []
+    for idx in moves:
+        board.place(idx, color)
+        scores.append(evaluate_board(board, BLACK))
+        board.undo(idx, color)
+    return scores
+
+
+class WindowEvaluator:
+    """evaluate_board kept up to date move by move.
+
+    Holds every window's stone counts and the running score from black's
+    side; placing or removing a stone only touches the windows through
+    that cell. Attach it to a board with board.attach(WindowEvaluator).
+    """
+
+    __slots__ = ('codes', 'score')
+
+    def __init__(self, board=None):
+        self.codes = [0] * len(WINDOWS)
+        self.score = 0
+        if board is not None:
+            for color in (BLACK, WHITE):
+                for idx in iter_indices(board.stones[color]):
+                    self.place(idx, color)
+
+    def copy(self):
+        evaluator = WindowEvaluator()
+        evaluator.codes = self.codes[:]
+        evaluator.score = self.score
+        return evaluator
+
+    def place(self, idx, color):
+        add = WINDOW_ADD[color]
+        codes = self.codes
+        delta = 0
+        for w in CELL_WINDOWS[idx]:
+            code = codes[w]
+            codes[w] = code + add
+            delta += WINDOW_VALUES[code + add] - WINDOW_VALUES[code]
+        self.score += delta
+
+    def remove(self, idx, color):
+        add = WINDOW_ADD[color]
+        codes = self.codes
+        delta = 0
+        for w in CELL_WINDOWS[idx]:
+            code = codes[w]
+            codes[w] = code - add
+            delta += WINDOW_VALUES[code - add] - WINDOW_VALUES[code]
+        self.score += delta
+
+    def evaluate(self, player):
+        """Same value as evaluate_board(board, player)."""
+        return self.score if player == BLACK else -self.score
+
+    def child_scores(self, moves, color):
+        """Black-side scores after `color` plays each of `moves`, without playing them."""
+        add = WINDOW_ADD[color]
+        codes = self.codes
+        base = self.score
+        scores = []
+        for idx in moves:
+            delta = 0
+            for w in CELL_WINDOWS[idx]:
+                code = codes[w]
+                delta += WINDOW_VALUES[code + add] - WINDOW_VALUES[code]
+            scores.append(base + delta)
+        return scores
+
+
+def run_score(count, open_ends):
+    if count >= WIN_COUNT:
+        return 100000
+    if count == 4 and open_ends == 2:
+        return 10000
+    if count == 4 and open_ends == 1:
+        return 1000
+    if count == 3 and open_ends == 2:
+        return 500
+    if count == 3 and open_ends == 1:
+        return 100
+    if count == 2 and open_ends == 2:
+        return 50
+    if count == 2 and open_ends == 1:
+        return 10
+    return 0
+
+
+def _open(bit, occupied):
+    return bit & FULL and not bit & occupied
+
+
+def heuristic(board):
+    """Run-based score, positive for black and negative for white.
+
+    Every stone is credited with the run it belongs to, so a run of n
+    stones contributes n times its score.
+    """
+    occupied = board.occupied()
+    score = 0
+    for color, modifier in ((BLACK, 1), (WHITE, -1)):
+        bits = board.stones[color]
+        for s in DIRECTIONS:
+            # First stone of every run that is at least two long
+            starts = bits & ~(bits << s) & (bits >> s)
+            while starts:
+                low = starts & -starts
+                starts ^= low
+                count = 1
+                end = low << s
+                while bits & end:
+                    count += 1
+                    end <<= s
+                open_ends = 0
+                if _open(low >> s, occupied):
+                    open_ends += 1
+                if _open(end, occupied):
+                    open_ends += 1
+                score += modifier * count * run_score(count, open_ends)
+    return score
+
+
+def heuristic_children(board, moves, color):
+    """heuristic() after `color` plays each of `moves`."""
+    scores = []
+    for idx in moves:
+        board.place(idx, color)
+        scores.append(heuristic(board))
+        board.undo(idx, color)
+    return scores
+
+
+def _lines():
+    """Every row, column and diagonal with at least two cells, as lists of indices."""
+    lines = [[i * BOARD_SIZE + j for j in range(BOARD_SIZE)] for i in range(BOARD_SIZE)]
+    lines += [[i * BOARD_SIZE + j for i in range(BOARD_SIZE)] for j in range(BOARD_SIZE)]
+    for d in range(-(BOARD_SIZE - 2), BOARD_SIZE - 1):
+        lines.append([i * BOARD_SIZE + i - d for i in range(BOARD_SIZE) if 0 <= i - d < BOARD_SIZE])
+    for d in range(1, 2 * BOARD_SIZE - 2):
+        lines.append([i * BOARD_SIZE + d - i for i in range(BOARD_SIZE) if 0 <= d - i < BOARD_SIZE])
+    return lines
+
+
+LINES = _lines()
+
+# A line is encoded as length << 32 | white << 16 | black, where black and
+# white are bitmasks of the stones along it
+LINE_SHIFT = (0, 0, 16)
+CELL_LINES = tuple(
+    tuple((n, line.index(idx)) for n, line in enumerate(LINES) if idx in line) for idx in range(CELLS)
+)
+
+# Memo of line_score() by code. Games keep reaching new lines, so it is
+# emptied when full rather than left to grow for the life of the process.
+LINE_CACHE_SIZE = 1 << 16
+_line_scores = {}
+
+
+def line_score(code):
+    """heuristic() restricted to one encoded line, memoised by code."""
+    score = _line_scores.get(code)
+    if score is not None:
+        return score
+    if len(_line_scores) >= LINE_CACHE_SIZE:
+        _line_scores.clear()
+    length = code >> 32
+    cells = [BLACK if code >> pos & 1 else WHITE if code >> (pos + 16) & 1 else 0 for pos in range(length)]
+    score = 0
+    pos = 0
+    while pos < length:
+        color = cells[pos]
+        end = pos + 1
+        while end < length and cells[end] == color:
+            end += 1
+        count = end - pos
+        if color and count >= 2:
+            open_ends = (pos > 0 and cells[pos - 1] == 0) + (end < length and cells[end] == 0)
+            modifier = 1 if color == BLACK else -1
+            score += modifier * count * run_score(count, open_ends)
+        pos = end
+    _line_scores[code] = score
+    return score
+
+
+class LineEvaluator:
+    """heuristic() kept up to date move by move.
+
+    Holds an encoded code and cached score for each of the 84 lines; a
+    move only re-scores the (at most four) lines through its cell. Attach
+    it to a board with board.attach(LineEvaluator).
+    """
+
+    __slots__ = ('codes', 'scores', 'score')
+
+    def __init__(self, board=None):
+        self.codes = [len(line) << 32 for line in LINES]
+        self.scores = [0] * len(LINES)
+        self.score = 0
+        if board is not None:
+            for color in (BLACK, WHITE):
+                for idx in iter_indices(board.stones[color]):
+                    self.place(idx, color)
+
+    def copy(self):
+        evaluator = LineEvaluator()
+        evaluator.codes = self.codes[:]
+        evaluator.scores = self.scores[:]
+        evaluator.score = self.score
+        return evaluator
+
+    def _update(self, idx, delta_shift, sign):
+        codes = self.codes
+        scores = self.scores
+        total = self.score
+        for n, pos in CELL_LINES[idx]:
+            code = codes[n] + sign * (1 << (pos + delta_shift))
+            codes[n] = code
+            score = _line_scores.get(code)
+            if score is None:
+                score = line_score(code)
+            total += score - scores[n]
+            scores[n] = score
+        self.score = total
+
+    def place(self, idx, color):
+        self._update(idx, LINE_SHIFT[color], 1)
+
+    def remove(self, idx, color):
+        self._update(idx, LINE_SHIFT[color], -1)
+
+    def evaluate(self):
+        """Same value as heuristic(board)."""
+        return self.score
+
+    def child_scores(self, moves, color):
+        """Scores after `color` plays each of `moves`, without playing them."""
+        shift = LINE_SHIFT[color]
+        codes = self.codes
+        line_scores = self.scores
+        base = self.score
+        scores = []
+        for idx in moves:
+            delta = 0
+            for n, pos in CELL_LINES[idx]:
+                code = codes[n] + (1 << (pos + shift))
+                score = _line_scores.get(code)
+                if score is None:
+                    score = line_score(code)
+                delta += score - line_scores[n]
+            scores.append(base + delta)
+        return scores
@@ -0,0 +1,137 @@
+"""Optional NumPy backend for full-board evaluation.
+
+evaluate_board() and heuristic() here return exactly the same scores as
+the pure-Python functions in engine.evaluation, but score every window
+and every run in a handful of array operations. They pay off when whole
+boards are scored from scratch, e.g. bulk analysis; inside a search the
+incremental evaluators are cheaper still.
+
+NumPy is not required by the rest of the engine: check AVAILABLE before
+using this module. Benchmark/numpy_parity.py runs check_parity() on seeded random boards.
+"""
+
+from .board import BITS, BLACK, BOARD_SIZE, CELLS, STRIDE, WHITE
+from .evaluation import LINES, WINDOW_VALUES, WINDOWS, run_score
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+WALL = 3
+
+if AVAILABLE:
+    WINDOW_INDEX = np.array(WINDOWS, dtype=np.intp)
+    WINDOW_TABLE = np.array(WINDOW_VALUES, dtype=np.int64)
+
+    # Every line padded to the board size with the off-board cell CELLS,
+    # then walled on both sides so runs never cross from one line to the next
+    _padded = [[CELLS] + line + [CELLS] * (BOARD_SIZE + 1 - len(line)) for line in LINES]
+    LINE_INDEX = np.array(_padded, dtype=np.intp).ravel()
+
+    # RUN_TABLE[n, open_ends]: what a run of n stones adds to heuristic()
+    RUN_TABLE = np.array([[n * run_score(n, o) if n >= 2 else 0 for o in range(3)]
+                          for n in range(BOARD_SIZE + 1)], dtype=np.int64)
+
+
+BOARD_BYTES = STRIDE * BOARD_SIZE // 8
+
+
+def _unpack(bitboards):
+    """(len(bitboards), 15, 15) uint8 array of the bits of each bitboard."""
+    raw = np.frombuffer(b''.join(bits.to_bytes(BOARD_BYTES, 'little') for bits in bitboards), dtype=np.uint8)
+    bits = np.unpackbits(raw, bitorder='little').reshape(len(bitboards), BOARD_SIZE, STRIDE)
+    return bits[:, :, :BOARD_SIZE]
+
+
+def _stack(blacks, whites):
+    """(len(blacks), CELLS + 1) array of cells, each row ending with a wall cell."""
+    black = _unpack(blacks).reshape(len(blacks), CELLS)
+    white = _unpack(whites).reshape(len(whites), CELLS)
+    cells = np.full((len(blacks), CELLS + 1), WALL, dtype=np.int8)
+    cells[:, :CELLS] = black + 2 * white
+    return cells
+
+
+def _children(board, moves, color):
+    """Black and white bitboards of the positions after `color` plays each move."""
+    blacks = [board.stones[BLACK]] * len(moves)
+    whites = [board.stones[WHITE]] * len(moves)
+    grown = blacks if color == BLACK else whites
+    for i, idx in enumerate(moves):
+        grown[i] |= BITS[idx]
+    return blacks, whites
+
+
+def _window_scores(blacks, whites):
+    windows = _stack(blacks, whites)[:, WINDOW_INDEX]
+    black = (windows == BLACK).sum(axis=2)
+    white = (windows == WHITE).sum(axis=2)
+    return WINDOW_TABLE[6 * black + white].sum(axis=1)
+
+
+def _line_scores(blacks, whites):
+    """Every line of every board is laid end to end; the walls between them
+    keep runs apart, so one run-length encoding covers the whole batch."""
+    lines = _stack(blacks, whites)[:, LINE_INDEX].ravel()
+    scores = np.zeros(len(blacks), dtype=np.int64)
+    for color, modifier in ((BLACK, 1), (WHITE, -1)):
+        edges = np.diff(np.concatenate(([0], (lines == color).astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        open_ends = (lines[starts - 1] == 0).astype(np.intp) + (lines[ends] == 0)
+        runs = RUN_TABLE[ends - starts, open_ends]
+        scores += modifier * np.bincount(starts // LINE_INDEX.size, weights=runs,
+                                         minlength=len(blacks)).astype(np.int64)
+    return scores
+
+
+def evaluate_boards(boards, player):
+    """evaluate_board() for many boards at once, as an int64 array."""
+    scores = _window_scores([board.stones[BLACK] for board in boards], [board.stones[WHITE] for board in boards])
+    return scores if player == BLACK else -scores
+
+
+def heuristics(boards):
+    """heuristic() for many boards at once, as an int64 array."""
+    return _line_scores([board.stones[BLACK] for board in boards], [board.stones[WHITE] for board in boards])
+
+
+def evaluate_children(board, moves, color):
+    """Black-side evaluate_board() after `color` plays each move, in one vectorised call."""
+    return _window_scores(*_children(board, moves, color)).tolist()
+
+
+def heuristic_children(board, moves, color):
+    """heuristic() after `color` plays each move, in one vectorised call."""
+    return _line_scores(*_children(board, moves, color)).tolist()
+
+
+def evaluate_board(board, player):
+    """evaluate_board() computed over all windows at once."""
+    return int(evaluate_boards([board], player)[0])
+
+
+def heuristic(board):
+    """heuristic() computed from run-length encodings of every line."""
+    return int(heuristics([board])[0])
+
+
+def check_parity(boards):
+    """Compare this backend against engine.evaluation; return the boards that differ."""
+    from . import evaluation
+
+    mismatches = []
+    for board in boards:
+        moves = board.empty_indices()
+        if (heuristic(board) != evaluation.heuristic(board)
+                or evaluate_board(board, BLACK) != evaluation.evaluate_board(board, BLACK)
+                or evaluate_board(board, WHITE) != evaluation.evaluate_board(board, WHITE)
+                or any(heuristic_children(board, moves, color) != evaluation.heuristic_children(board, moves, color)
+                       or evaluate_children(board, moves, color) != evaluation.evaluate_children(board, moves, color)
+                       for color in (BLACK, WHITE))):
+            mismatches.append(board)
+    return mismatches
+
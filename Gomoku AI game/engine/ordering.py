@@ -0,0 +1,46 @@
+"""Move ordering for alpha-beta: hash move, killer moves, then history."""
+
+from .board import BITS, CELLS, iter_indices
+
+MAX_PLY = 64
+
+
+class MoveOrderer:
+    """Killer and history tables shared by every node of a search.
+
+    Keep one orderer across the iterations of iterative deepening (and
+    across moves) so what earlier searches learnt orders the next one.
+    """
+
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * CELLS for _ in range(3)]
+
+    def stages(self, mask, ply, color, hash_move=None):
+        """Yield the moves in `mask` as two lists: hash move and killers, then the rest by history.
+
+        Lets a caller handle each list in one batch while still skipping
+        the sort when the first list produces a cutoff.
+        """
+        tried = []
+        for idx in (hash_move, *self.killers[ply]):
+            if idx is not None and mask & BITS[idx] and idx not in tried:
+                tried.append(idx)
+        yield tried
+        for idx in tried:
+            mask ^= BITS[idx]
+        rest = list(iter_indices(mask))
+        rest.sort(key=self.history[color].__getitem__, reverse=True)
+        yield rest
+
+    def cutoff(self, idx, ply, color, depth):
+        """Record that `idx` caused a beta cutoff."""
+        killers = self.killers[ply]
+        if killers[0] != idx:
+            killers[1] = killers[0]
+            killers[0] = idx
+        self.history[color][idx] += depth * depth
+
+    def advance(self, plies=1):
+        """Shift the killers after `plies` moves were played, so each stays with its ply of the game."""
+        self.killers = self.killers[plies:] + [[None, None] for _ in range(plies)]
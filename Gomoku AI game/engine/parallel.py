@@ -0,0 +1,228 @@
+"""Root-splitting parallel search over a pool of worker processes.
+
+Experimental: no speedup over the serial search has been measured yet.
+On one core it is about twice as slow, and it has not been timed on a
+multi-core machine, so nothing uses it by default (AiVsAi's
+SEARCH_WORKERS is 1). Measure with several workers before enabling it.
+
+A pure-Python search is CPU bound, so threads do not help: the root's
+candidate moves are searched in separate processes instead. The first
+root move is searched on its own to set a bound, then the rest are
+spread across the pool. Workers publish the best root score found so far
+in shared memory, and every root move searched afterwards uses it as its
+alpha (beta for white), so it prunes like a serial search that had
+already seen that move.
+
+A search is abandoned through a shared multiprocessing.Event that every
+worker passes to the search as its `cancel` event.
+
+Workers are spawned, not forked: searches are usually started from a
+background thread of a Tk process, and forking a process with threads
+can leave locks held in the child.
+
+Each worker process keeps its own transposition tables and move orderer
+across tasks, so iterative deepening still warms them from one depth to
+the next.
+"""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import time
+
+from . import evaluation
+from .board import BLACK, WHITE, Board, other_player
+from .ordering import MoveOrderer
+from .search import MAX_DEPTH, SearchTimeout, alphabeta_search, evaluation_backend, minimax, tactical_move
+from .stats import SearchStats
+from .transposition import TranspositionTable
+
+CANCEL_POLL = 0.05  # seconds between checks of a caller's cancel event
+
+# Per-process state of a worker, set up by _init_worker()
+_bound = None
+_stop = None
+_worker = {}
+
+
+def _init_worker(bound, stop, size_mb):
+    global _bound, _stop
+    _bound = bound
+    _stop = stop
+    _worker['size_mb'] = size_mb
+    _worker['generation'] = None
+
+
+def _reset_worker(generation):
+    """Start from empty tables when the pool owner called clear()."""
+    if _worker['generation'] != generation:
+        _worker['generation'] = generation
+        table = TranspositionTable(_worker['size_mb'])
+        # pvs scores like alphabeta, so the two share a table
+        _worker['tables'] = {'alphabeta': table, 'pvs': table, 'minimax': TranspositionTable(_worker['size_mb'])}
+        _worker['orderer'] = MoveOrderer()
+
+
+def _search_move(position, idx, player, depth, engine, backend, generation, stop, timing=None):
+    """Score root move idx for `player` in a worker process.
+
+    Returns (score from `player`'s side, SearchStats or None), or None if
+    the search ran past `stop`, a time.time() value. The stats are only
+    collected when `timing` is not None.
+    """
+    _reset_worker(generation)
+    table = _worker['tables'][engine]
+    orderer = _worker['orderer']
+    deadline = None if stop is None else time.perf_counter() + (stop - time.time())
+
+    board = Board(*position)
+    board.place(idx, player)
+    opponent = other_player(player)
+    sign = 1 if player == BLACK else -1
+    stats = None if timing is None else SearchStats(timing)
+    try:
+        if engine == 'minimax':
+            score, _ = minimax(board, depth - 1, opponent, player, idx, table, deadline, backend=backend,
+                               cancel=_stop, stats=stats)
+        elif depth == 1 or board.is_terminal_at(idx):
+            score = sign * (evaluation_backend(backend) or evaluation).heuristic(board)
+            if stats is not None:
+                stats.nodes_per_ply[0] += 1
+                stats.evaluations += 1
+        else:
+            # One below the bound, so a move that only ties it still gets an
+            # exact score and ties are broken by root order as in a serial search
+            bound = _bound.value - 1
+            if player == BLACK:
+                alpha, beta = bound, math.inf
+            else:
+                alpha, beta = -math.inf, -bound
+            score, _ = alphabeta_search(board, alpha, beta, opponent, depth - 1, table, deadline,
+                                        orderer=orderer, backend=backend, cancel=_stop, stats=stats,
+                                        scout=engine == 'pvs')
+            score *= sign
+    except SearchTimeout:
+        return None
+
+    with _bound.get_lock():
+        if score > _bound.value:
+            _bound.value = score
+    return score, stats
+
+
+class ParallelSearch:
+    """Pool of worker processes that split the root moves of every search.
+
+    `workers` defaults to os.cpu_count(). Keep one instance across moves
+    so the workers keep their tables; call clear() for a new game and
+    close() (or use a `with` block) to stop the processes.
+    """
+
+    def __init__(self, workers=None, size_mb=16, backend='incremental'):
+        evaluation_backend(backend)
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        context = multiprocessing.get_context('spawn')
+        self.bound = context.Value('d', -math.inf)
+        self.stop = context.Event()
+        self.executor = concurrent.futures.ProcessPoolExecutor(self.workers, context, _init_worker,
+                                                               (self.bound, self.stop, size_mb))
+        self.generation = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def clear(self):
+        """Empty the workers' tables, e.g. for a new game."""
+        self.generation += 1
+
+    def search(self, board, player, depth, engine='alphabeta', first=None, stop=None, cancel=None, stats=None):
+        """Return (score, best_index) for `player`, scored from `player`'s side.
+
+        `first` is searched before the other root moves, e.g. the best
+        move of a shallower search. Raises SearchTimeout once `stop`, a
+        time.time() value, has passed or the `cancel` event is set. The
+        workers' counters are added to `stats`, a SearchStats.
+        """
+        moves = list(board.candidates())
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        with self.bound.get_lock():
+            self.bound.value = -math.inf
+        position = (board.stones[BLACK], board.stones[WHITE], board.radius)
+        args = (player, depth, engine, self.backend, self.generation, stop, None if stats is None else stats.timing)
+
+        if stats is not None:
+            stats.nodes_per_ply[0] += 1
+        scores = [self._result(self.executor.submit(_search_move, position, moves[0], *args), [], cancel, stats)]
+        futures = [self.executor.submit(_search_move, position, idx, *args) for idx in moves[1:]]
+        scores += [self._result(future, futures, cancel, stats) for future in futures]
+
+        best_score = -math.inf
+        best_move = None
+        for idx, score in zip(moves, scores):
+            if score > best_score:
+                best_score = score
+                best_move = idx
+        return best_score, best_move
+
+    def _wait(self, future, cancel):
+        """future.result(), or None as soon as `cancel` is set."""
+        if cancel is None:
+            return future.result()
+        while not cancel.is_set():
+            try:
+                return future.result(timeout=CANCEL_POLL)
+            except concurrent.futures.TimeoutError:
+                pass
+        return None
+
+    def _result(self, future, pending, cancel, stats):
+        result = self._wait(future, cancel)
+        if result is None:
+            # Stop the running tasks and wait for them, so none of them
+            # writes to the shared bound during the next search
+            self.stop.set()
+            for other in pending:
+                other.cancel()
+            concurrent.futures.wait([future, *pending])
+            self.stop.clear()
+            raise SearchTimeout
+        score, worker_stats = result
+        if worker_stats is not None:
+            stats.merge(worker_stats, ply=1)
+        return score
+
+    def iterative_deepening(self, board, player, time_limit, engine='alphabeta', max_depth=MAX_DEPTH, cancel=None,
+                            stats=None, threats=True):
+        """Parallel counterpart of search.iterative_deepening(); returns (best_index, depth)."""
+        start = time.perf_counter()
+        if threats:
+            move = tactical_move(board, player, start + time_limit, cancel, stats)
+            if move is not None:
+                return move, 0
+        stop = time.time() + time_limit
+        max_depth = min(max_depth, len(board.empty_indices()))
+        best_move = None
+        completed = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                _, move = self.search(board, player, depth, engine, best_move, None if depth == 1 else stop,
+                                      cancel, stats)
+            except SearchTimeout:
+                break
+            best_move = move
+            completed = depth
+            if stats is not None:
+                stats.finish_depth(time.perf_counter() - start)
+            if time.time() > stop:
+                break
+        return best_move, completed
@@ -0,0 +1,66 @@
+"""Pondering: searching on the opponent's time.
+
+While the opponent thinks, ponder() predicts their most likely moves and
+searches a reply to each with the same time budget as a normal move.
+Every search shares the caller's transposition table, so even a miss
+leaves the table warm for the real search.
+"""
+
+from .board import BLACK, other_player
+from .evaluation import LineEvaluator, WindowEvaluator
+from .search import iterative_deepening
+from .transposition import TranspositionTable
+
+PONDER_MOVES = 3
+
+
+def likely_moves(board, player, count, engine='alphabeta', table=None, time_limit=None, cancel=None):
+    """Up to `count` moves `player` is likely to play, most likely first.
+
+    With a `time_limit`, the first one is the result of a search of that
+    long; the others are ranked by the static score after the move, with
+    the evaluator `engine` uses. The searched move can lie outside
+    board.candidates() (a distant four or threat-space first move found
+    by the tactical pre-pass); it still goes first.
+    """
+    moves = list(board.candidates())
+    kind = WindowEvaluator if engine == 'minimax' else LineEvaluator
+    # child_scores() is from black's side; the sort is stable, so ties keep board order
+    sign = -1 if player == BLACK else 1
+    scores = kind(board).child_scores(moves, player)
+    ranked = [idx for _, idx in sorted(zip(scores, moves), key=lambda pair: sign * pair[0])]
+    if time_limit is not None:
+        best, _ = iterative_deepening(board, player, time_limit, engine, table, cancel=cancel)
+        if best is not None:
+            if best in ranked:
+                ranked.remove(best)
+            ranked.insert(0, best)
+    return ranked[:count]
+
+
+def ponder(board, player, time_limit, engine='alphabeta', table=None, replies=None, moves=PONDER_MOVES,
+           cancel=None):
+    """Search `player`'s replies to the opponent's likely moves ahead of time.
+
+    Each finished reply is stored in `replies` under board.key(player) of
+    the position it answers, so after the opponent's move the caller can
+    look it up and play it at once (a ponder hit). A search cut short by
+    `cancel` is not stored. Returns `replies`.
+    """
+    if table is None:
+        table = TranspositionTable()
+    if replies is None:
+        replies = {}
+    opponent = other_player(player)
+    for idx in likely_moves(board, opponent, moves, engine, table, time_limit, cancel):
+        if cancel is not None and cancel.is_set():
+            break
+        work = board.copy()
+        work.place(idx, opponent)
+        if work.is_terminal_at(idx):
+            continue
+        reply, _ = iterative_deepening(work, player, time_limit, engine, table, cancel=cancel)
+        if cancel is not None and cancel.is_set():
+            break
+        replies[work.key(player)] = reply
+    return replies
@@ -0,0 +1,102 @@
+"""Compact position for front-ends and for keeping many positions in memory.
+
+A Position is one byte per cell plus the side to move, the Zobrist hash,
+the stone count and the moves played, so tens of thousands of them fit
+in a few megabytes. It hashes like a Board, so keys can be looked up in
+a transposition table or opening book directly, and to_board() gives the
+Board the searches work on.
+"""
+
+from .board import BLACK, BOARD_SIZE, CELLS, EMPTY, SIDE, WHITE, WIN_COUNT, ZOBRIST, Board, other_player
+
+LINES = ((0, 1), (1, 0), (1, 1), (1, -1))  # → ↓ ↘ ↙
+
+# translate() tables turning the cells of one colour into b'1' and the rest into b'0'
+_DIGITS = {color: bytes(ord('1') if value == color else ord('0') for value in range(256)) for color in (BLACK, WHITE)}
+
+
+class Position:
+    """Cells, side to move, hash, stone count and move history of a game."""
+
+    __slots__ = ('cells', 'to_move', 'hash', 'count', 'history')
+
+    def __init__(self):
+        self.cells = bytearray(CELLS)  # EMPTY, BLACK or WHITE per flat index
+        self.to_move = BLACK
+        self.hash = 0
+        self.count = 0
+        self.history = bytearray()  # flat indices of the stones in the order played
+
+    def copy(self):
+        position = Position.__new__(Position)
+        position.cells = self.cells[:]
+        position.to_move = self.to_move
+        position.hash = self.hash
+        position.count = self.count
+        position.history = self.history[:]
+        return position
+
+    def get(self, idx):
+        return self.cells[idx]
+
+    def is_empty(self, idx):
+        return self.cells[idx] == EMPTY
+
+    def is_full(self):
+        return self.count == CELLS
+
+    def place(self, idx):
+        """Put a stone of the side to move on idx and pass the move to the other side."""
+        color = self.to_move
+        self.cells[idx] = color
+        self.hash ^= ZOBRIST[color][idx]
+        self.count += 1
+        self.history.append(idx)
+        self.to_move = other_player(color)
+
+    def undo(self):
+        """Take back the last stone played."""
+        idx = self.history.pop()
+        color = self.cells[idx]
+        self.cells[idx] = EMPTY
+        self.hash ^= ZOBRIST[color][idx]
+        self.count -= 1
+        self.to_move = color
+
+    def key(self):
+        """Transposition key with the side to move, the same as Board.key()."""
+        return self.hash ^ SIDE[self.to_move]
+
+    def wins_at(self, idx):
+        """True if the stone on idx is part of five."""
+        color = self.cells[idx]
+        row, col = divmod(idx, BOARD_SIZE)
+        for dr, dc in LINES:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and self.cells[r * BOARD_SIZE + c] == color:
+                    count += 1
+                    r += sign * dr
+                    c += sign * dc
+            if count >= WIN_COUNT:
+                return True
+        return False
+
+    def winner(self):
+        """Colour of the player whose last stone made five, or EMPTY."""
+        if self.history and self.wins_at(self.history[-1]):
+            return other_player(self.to_move)
+        return EMPTY
+
+    def is_terminal(self):
+        return self.is_full() or self.winner() != EMPTY
+
+    def bits(self, color):
+        """Bitboard of `color`'s stones, laid out as in Board."""
+        # A zero byte after each row lines the cells up with the guard column
+        rows = b'\0'.join(self.cells[r:r + BOARD_SIZE] for r in range(0, CELLS, BOARD_SIZE))
+        return int(rows.translate(_DIGITS[color])[::-1], 2)
+
+    def to_board(self, radius=1):
+        return Board(self.bits(BLACK), self.bits(WHITE), radius)
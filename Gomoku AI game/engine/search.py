@@ -0,0 +1,440 @@
+"""Minimax and alpha-beta search over a Board.
+
+Both searches play and take back moves on the board they are given, so
+no child boards are allocated; the board is back in its original state
+when they return.
+
+Each search takes an optional TranspositionTable. Pass the same table
+across moves to keep what earlier searches learnt; minimax and
+alphabeta score positions differently, so they must not share a table.
+
+Nodes one ply above the leaves do not play their moves at all: every
+child's static score is computed in one batch call from the parent
+position (child_scores() on the incremental evaluators, or the backend's
+evaluate_children()/heuristic_children()). A child at depth 0 is scored
+statically whether or not it ends the game, so this gives the same
+values as playing each move.
+
+Searches given a `deadline` (a time.perf_counter() value) raise
+SearchTimeout once it has passed; iterative_deepening() uses this to
+stop at a time budget instead of a fixed depth. A `cancel` event
+(anything with is_set(), e.g. a threading.Event) stops them the same
+way as soon as it is set, so a search on another thread can be
+abandoned.
+
+A SearchStats passed as `stats` counts the nodes visited at each ply
+(children scored in a batch included), beta cutoffs, terminal checks,
+evaluations and table probes, and with its timing on, the time spent
+generating moves, testing for terminal positions and evaluating.
+"""
+
+import functools
+import math
+import time
+
+from . import evaluation, numpy_eval
+from .board import BLACK, WHITE, other_player
+from .evaluation import LineEvaluator, WindowEvaluator
+from .ordering import MoveOrderer
+from .threats import immediate_move, vct
+from .timeout import SearchTimeout, check_deadline
+from .transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+
+MAX_DEPTH = 20
+ASPIRATION_WINDOW = 1000
+
+
+def is_terminal(board, last, stats=None):
+    """Terminal test for a search node reached by playing `last` (None at the root)."""
+    if stats is not None:
+        stats.terminal_checks += 1
+        if stats.timing:
+            return stats.timed('terminal', is_terminal, board, last)
+    if last is None:
+        return board.is_terminal()
+    return board.is_terminal_at(last)
+
+
+def candidate_list(board, stats=None):
+    """board.candidates() as a list, timed as move generation when `stats` is timing."""
+    if stats is not None and stats.timing:
+        return stats.timed('movegen', list, board.candidates())
+    return list(board.candidates())
+
+
+def evaluation_backend(name):
+    """Module providing evaluate_board() and heuristic() for a backend name.
+
+    'incremental' (None) means the evaluators attached to the board;
+    'python' and 'numpy' rescore the whole board at every leaf. Each
+    module also scores a batch of children with evaluate_children() and
+    heuristic_children().
+    """
+    if name == 'incremental':
+        return None
+    if name == 'python':
+        return evaluation
+    if name == 'numpy':
+        if not numpy_eval.AVAILABLE:
+            raise ValueError("the numpy evaluation backend needs NumPy installed")
+        return numpy_eval
+    raise ValueError(f"unknown evaluation backend {name!r}")
+
+
+def minimax(board, depth, player, maximizing_player, last=None, table=None, deadline=None, evaluate=None,
+            backend='incremental', children=None, cancel=None, stats=None, ply=0):
+    """Return (score, best_index) for `player`, scored for `maximizing_player`.
+
+    With the default backend, leaves are scored by a WindowEvaluator
+    attached to the board, which gives the same value as evaluate_board
+    without rescanning. `evaluate`, `children` and `ply` are passed down
+    the recursion; callers leave them unset.
+    """
+    if evaluate is None:
+        module = evaluation_backend(backend)
+        if module is None:
+            evaluator = board.attach(WindowEvaluator)
+            evaluate, children = evaluator.evaluate, evaluator.child_scores
+        else:
+            evaluate = functools.partial(module.evaluate_board, board)
+            children = functools.partial(module.evaluate_children, board)
+        if stats is not None:
+            evaluate, children = stats.counted(evaluate, children)
+    if stats is not None:
+        stats.nodes_per_ply[ply] += 1
+    if depth == 0 or is_terminal(board, last, stats):
+        return evaluate(maximizing_player), None
+    if table is None:
+        table = TranspositionTable()
+    # Entries are stored from black's point of view so both sides can reuse them
+    sign = 1 if maximizing_player == BLACK else -1
+
+    check_deadline(deadline, cancel)
+    key = board.key(player)
+    if last is not None:
+        entry = table.probe(key)
+        if stats is not None:
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        if entry is not None and entry[1] >= depth:
+            return sign * entry[3], entry[4]
+
+    best_move = None
+    opponent = other_player(player)
+    moves = candidate_list(board, stats)
+    if depth == 1:
+        scores = children(moves, player)
+        if stats is not None:
+            stats.nodes_per_ply[ply + 1] += len(moves)
+        if maximizing_player != BLACK:
+            scores = [-score for score in scores]
+        if player == maximizing_player:
+            best_eval = -math.inf
+            for idx, eval_score in zip(moves, scores):
+                if eval_score > best_eval:
+                    best_eval = eval_score
+                    best_move = idx
+        else:
+            best_eval = math.inf
+            for idx, eval_score in zip(moves, scores):
+                if eval_score < best_eval:
+                    best_eval = eval_score
+                    best_move = idx
+    elif player == maximizing_player:
+        best_eval = -math.inf
+        for idx in moves:
+            board.place(idx, player)
+            eval_score, _ = minimax(board, depth - 1, opponent, maximizing_player, idx, table, deadline, evaluate,
+                                    children=children, cancel=cancel, stats=stats, ply=ply + 1)
+            board.undo(idx, player)
+            if eval_score > best_eval:
+                best_eval = eval_score
+                best_move = idx
+    else:
+        best_eval = math.inf
+        for idx in moves:
+            board.place(idx, player)
+            eval_score, _ = minimax(board, depth - 1, opponent, maximizing_player, idx, table, deadline, evaluate,
+                                    children=children, cancel=cancel, stats=stats, ply=ply + 1)
+            board.undo(idx, player)
+            if eval_score < best_eval:
+                best_eval = eval_score
+                best_move = idx
+    table.store(key, depth, EXACT, sign * best_eval, best_move)
+    return best_eval, best_move
+
+
+def alphabeta(board, alpha, beta, player, depth, table=None, deadline=None, first=None, orderer=None,
+              backend='incremental', cancel=None, stats=None):
+    """Return the index of the best move for `player`; see alphabeta_search()."""
+    return alphabeta_search(board, alpha, beta, player, depth, table, deadline, first, orderer, backend, cancel,
+                            stats)[1]
+
+
+def pvs(board, alpha, beta, player, depth, table=None, deadline=None, first=None, orderer=None,
+        backend='incremental', cancel=None, stats=None):
+    """Return the index of the best move for `player` by principal variation search."""
+    return alphabeta_search(board, alpha, beta, player, depth, table, deadline, first, orderer, backend, cancel,
+                            stats, scout=True)[1]
+
+
+def alphabeta_search(board, alpha, beta, player, depth, table=None, deadline=None, first=None, orderer=None,
+                     backend='incremental', cancel=None, stats=None, scout=False):
+    """Return (score, best_index) for `player`; black maximises the heuristic.
+
+    Moves are tried hash move first, then killers, then by history score.
+    `first` overrides the hash move at the root, e.g. with the best move
+    of a shallower search. With the default backend, leaves are scored by
+    a LineEvaluator attached to the board, which gives the same value as
+    heuristic(). The score is exact when it falls strictly between alpha
+    and beta, and a bound otherwise.
+
+    With `scout` this is a principal variation search: only the first
+    move of a node gets the full window. Each later one is searched with
+    a null window to show it is no better, and searched again with the
+    full window when it is. Scores are integers, so a window of width one
+    is enough. With good ordering most scouts fail as expected and cost
+    less than full-window searches; the result is the same.
+    """
+    best_move = None
+    module = evaluation_backend(backend)
+    if module is None:
+        evaluator = board.attach(LineEvaluator)
+        evaluate, children = evaluator.evaluate, evaluator.child_scores
+    else:
+        evaluate = functools.partial(module.heuristic, board)
+        children = functools.partial(module.heuristic_children, board)
+    if stats is not None:
+        evaluate, children = stats.counted(evaluate, children)
+    if table is None:
+        table = TranspositionTable()
+    if orderer is None:
+        orderer = MoveOrderer()
+
+    def probe(key, alpha, beta, depth):
+        """Return (score or None, alpha, beta, hash_move) after consulting the table."""
+        entry = table.probe(key)
+        if stats is not None:
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        if entry is None:
+            return None, alpha, beta, None
+        _, entry_depth, flag, score, hash_move = entry
+        if entry_depth < depth or depth == max_depth:
+            return None, alpha, beta, hash_move
+        if flag == EXACT:
+            return score, alpha, beta, hash_move
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        if alpha >= beta:
+            return score, alpha, beta, hash_move
+        return None, alpha, beta, hash_move
+
+    def max_value(alpha, beta, depth, last):
+        nonlocal best_move
+        ply = max_depth - depth
+        if stats is not None:
+            stats.nodes_per_ply[ply] += 1
+        if depth == 0 or is_terminal(board, last, stats):
+            return evaluate()
+        check_deadline(deadline, cancel)
+        key = board.key(BLACK)
+        score, alpha, beta, hash_move = probe(key, alpha, beta, depth)
+        if score is not None:
+            return score
+        if ply == 0 and first is not None:
+            hash_move = first
+        alpha_orig = alpha
+        v = -math.inf
+        node_best = None
+        n = -1
+        stages = orderer.stages(board.candidate_mask(), ply, BLACK, hash_move)
+        if stats is not None and stats.timing:
+            stages = stats.timed_iter(stages, 'movegen')
+        for stage in stages:
+            if depth == 1:
+                leaf_scores = children(stage, BLACK)
+                if stats is not None:
+                    stats.nodes_per_ply[ply + 1] += len(stage)
+            for i, idx in enumerate(stage):
+                n += 1
+                if depth == 1:
+                    v2 = leaf_scores[i]
+                else:
+                    board.place(idx, BLACK)
+                    if scout and n > 0:
+                        # Prove the move no better than alpha with a null window first
+                        v2 = min_value(alpha, alpha + 1, depth - 1, idx)
+                        if alpha < v2 < beta:
+                            v2 = min_value(alpha, beta, depth - 1, idx)
+                    else:
+                        v2 = min_value(alpha, beta, depth - 1, idx)
+                    board.undo(idx, BLACK)
+                if v2 > v:
+                    v = v2
+                    node_best = idx
+                    if ply == 0:
+                        best_move = idx
+                if v >= beta:
+                    orderer.cutoff(idx, ply, BLACK, depth)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                        stats.first_move_cutoffs += n == 0
+                    table.store(key, depth, LOWER, v, node_best)
+                    return v
+                alpha = max(alpha, v)
+        table.store(key, depth, EXACT if v > alpha_orig else UPPER, v, node_best)
+        return v
+
+    def min_value(alpha, beta, depth, last):
+        nonlocal best_move
+        ply = max_depth - depth
+        if stats is not None:
+            stats.nodes_per_ply[ply] += 1
+        if depth == 0 or is_terminal(board, last, stats):
+            return evaluate()
+        check_deadline(deadline, cancel)
+        key = board.key(WHITE)
+        score, alpha, beta, hash_move = probe(key, alpha, beta, depth)
+        if score is not None:
+            return score
+        if ply == 0 and first is not None:
+            hash_move = first
+        beta_orig = beta
+        v = math.inf
+        node_best = None
+        n = -1
+        stages = orderer.stages(board.candidate_mask(), ply, WHITE, hash_move)
+        if stats is not None and stats.timing:
+            stages = stats.timed_iter(stages, 'movegen')
+        for stage in stages:
+            if depth == 1:
+                leaf_scores = children(stage, WHITE)
+                if stats is not None:
+                    stats.nodes_per_ply[ply + 1] += len(stage)
+            for i, idx in enumerate(stage):
+                n += 1
+                if depth == 1:
+                    v2 = leaf_scores[i]
+                else:
+                    board.place(idx, WHITE)
+                    if scout and n > 0:
+                        v2 = max_value(beta - 1, beta, depth - 1, idx)
+                        if alpha < v2 < beta:
+                            v2 = max_value(alpha, beta, depth - 1, idx)
+                    else:
+                        v2 = max_value(alpha, beta, depth - 1, idx)
+                    board.undo(idx, WHITE)
+                if v2 < v:
+                    v = v2
+                    node_best = idx
+                    if ply == 0:
+                        best_move = idx
+                if v <= alpha:
+                    orderer.cutoff(idx, ply, WHITE, depth)
+                    if stats is not None:
+                        stats.cutoffs += 1
+                        stats.first_move_cutoffs += n == 0
+                    table.store(key, depth, UPPER, v, node_best)
+                    return v
+                beta = min(beta, v)
+        table.store(key, depth, EXACT if v < beta_orig else LOWER, v, node_best)
+        return v
+
+    max_depth = depth
+    if player == BLACK:
+        score = max_value(alpha, beta, depth, None)
+    else:
+        score = min_value(alpha, beta, depth, None)
+    return score, best_move
+
+
+def tactical_move(board, player, deadline=None, cancel=None, stats=None):
+    """Move found by the tactical passes that run before a search, or None.
+
+    threats.immediate_move() finds a five, a forced block or an open four
+    at once; then a threat-space search (threats.vct()) looks for a
+    forced win, giving up at `deadline` or when `cancel` is set. `stats`
+    records which pass found the move in its `prepass` field.
+    """
+    move = immediate_move(board, player)
+    if move is not None:
+        if stats is not None:
+            stats.prepass = 'immediate'
+        return move
+    try:
+        line = vct(board, player, deadline=deadline, cancel=cancel)
+    except SearchTimeout:
+        return None
+    if line is None:
+        return None
+    if stats is not None:
+        stats.prepass = 'vct'
+    return line[0]
+
+
+def iterative_deepening(board, player, time_limit, engine='alphabeta', table=None, max_depth=MAX_DEPTH,
+                        orderer=None, backend='incremental', cancel=None, stats=None, threats=True):
+    """Search depth 1, 2, 3, ... until `time_limit` seconds have passed.
+
+    Returns (best_index, depth) from the deepest search that finished.
+    The 'pvs' engine is alpha-beta with scout searches (see
+    alphabeta_search()) that also starts each depth with a window of
+    ASPIRATION_WINDOW around the score found two depths before, searching
+    again with the full window when the score falls outside it.
+    Depth 1 always runs to completion so there is always a move, unless
+    `cancel` is set first; then the result may be (None, 0). A `stats`
+    object also gets the time at which each depth finished.
+
+    With `threats`, the tactical passes of tactical_move() run first
+    within the same time limit; a move they find is returned with depth
+    0, as no search ran. If they run out of time, depth 1 still runs.
+    """
+    start = time.perf_counter()
+    if threats:
+        move = tactical_move(board, player, start + time_limit, cancel, stats)
+        if move is not None:
+            return move, 0
+    if table is None:
+        table = TranspositionTable()
+    if orderer is None:
+        orderer = MoveOrderer()
+    deadline = start + time_limit
+    max_depth = min(max_depth, len(board.empty_indices()))
+    best_move = None
+    scores = []  # of each finished depth
+    completed = 0
+    for depth in range(1, max_depth + 1):
+        # Work on a copy: an aborted iteration leaves stones on its board
+        work = board.copy()
+        limit = None if depth == 1 else deadline
+        try:
+            if engine == 'minimax':
+                score, move = minimax(work, depth, player, player, table=table, deadline=limit, backend=backend,
+                                      cancel=cancel, stats=stats)
+            else:
+                scout = engine == 'pvs'
+                alpha, beta = -math.inf, math.inf
+                if scout and len(scores) >= 2:
+                    # Aspiration window. The side that moved last is ahead by a
+                    # move's worth, so the guess is the score two depths back.
+                    alpha, beta = scores[-2] - ASPIRATION_WINDOW, scores[-2] + ASPIRATION_WINDOW
+                score, move = alphabeta_search(work, alpha, beta, player, depth, table, limit, best_move, orderer,
+                                               backend, cancel, stats, scout)
+                if not alpha < score < beta:
+                    # Outside the window the score is only a bound: search again with the full window
+                    score, move = alphabeta_search(work, -math.inf, math.inf, player, depth, table, limit, best_move,
+                                                   orderer, backend, cancel, stats, scout)
+        except SearchTimeout:
+            break
+        best_move = move
+        scores.append(score)
+        completed = depth
+        if stats is not None:
+            stats.finish_depth(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return best_move, completed
@@ -0,0 +1,39 @@
+"""Engine state kept for the length of one game."""
+
+from .board import Board
+from .evaluation import LineEvaluator, WindowEvaluator
+from .ordering import MoveOrderer
+from .search import evaluation_backend, iterative_deepening
+from .transposition import TranspositionTable
+
+
+class Session:
+    """One game's board, transposition table and move orderer.
+
+    play() advances the board a stone at a time, so its candidate set
+    and attached evaluator are updated incrementally rather than rebuilt.
+    best_move() searches the current position with the table and the
+    killer and history moves earlier searches left behind, so every
+    search after the first starts warm: the subtrees it shares with the
+    previous search are already in the table.
+    """
+
+    def __init__(self, engine='alphabeta', size_mb=16, backend='incremental'):
+        evaluation_backend(backend)
+        self.engine = engine
+        self.backend = backend
+        self.board = Board()
+        if backend == 'incremental':
+            self.board.attach(WindowEvaluator if engine == 'minimax' else LineEvaluator)
+        self.table = TranspositionTable(size_mb)
+        self.orderer = MoveOrderer()
+
+    def play(self, idx, color):
+        """Place a stone for either side and make it the root of the next search."""
+        self.board.place(idx, color)
+        self.orderer.advance()
+
+    def best_move(self, player, time_limit, cancel=None, stats=None):
+        """(best_index, depth) for `player`; see search.iterative_deepening()."""
+        return iterative_deepening(self.board, player, time_limit, self.engine, self.table, orderer=self.orderer,
+                                   backend=self.backend, cancel=cancel, stats=stats)
@@ -0,0 +1,152 @@
+"""Counters a search fills in when it is given a SearchStats."""
+
+import json
+import time
+
+from .ordering import MAX_PLY
+
+SECTIONS = ('movegen', 'terminal', 'evaluation')
+
+
+class SearchStats:
+    """Work done by one or more searches.
+
+    Pass the same object to every search whose work should be summed,
+    e.g. all the iterations of iterative_deepening(). The counters are
+    plain increments, cheap enough to leave on. With timing=True the
+    searches also time move generation, terminal detection and
+    evaluation, which costs a few timer calls per node.
+    """
+
+    def __init__(self, timing=False):
+        self.timing = timing
+        # Nodes entered at each ply below the root, batch-scored leaves included
+        self.nodes_per_ply = [0] * (MAX_PLY + 2)
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.terminal_checks = 0
+        self.evaluations = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.seconds = dict.fromkeys(SECTIONS, 0.0)
+        # Seconds from the start of iterative_deepening() to the end of each depth
+        self.depth_times = []
+        # Nodes per ply of the last depth iterative_deepening() finished
+        self.depth_plies = None
+        # 'immediate' or 'vct' when a tactical pass before the search chose the move
+        self.prepass = None
+        self._depth_start = self.nodes_per_ply[:]
+
+    @property
+    def nodes(self):
+        return sum(self.nodes_per_ply)
+
+    def nps(self, seconds):
+        """Nodes per second over `seconds` of search."""
+        return self.nodes / seconds if seconds else 0.0
+
+    def first_cutoff_rate(self):
+        """Fraction of beta cutoffs produced by the first move tried."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def plies(self):
+        """Nodes per ply, without the unused deeper plies."""
+        plies = self.nodes_per_ply[:]
+        while plies and not plies[-1]:
+            plies.pop()
+        return plies
+
+    def finish_depth(self, seconds):
+        """Record that a depth of iterative deepening finished `seconds` after it started."""
+        self.depth_times.append(seconds)
+        plies = [n - start for n, start in zip(self.nodes_per_ply, self._depth_start)]
+        while plies and not plies[-1]:
+            plies.pop()
+        self.depth_plies = plies
+        self._depth_start = self.nodes_per_ply[:]
+
+    def branching_factor(self):
+        """Effective branching factor: the mean growth in nodes from one ply to the next.
+
+        Taken from the last depth iterative deepening finished, as the
+        earlier depths and an aborted last one would skew the counts;
+        from every node counted when there was no iterative deepening.
+        """
+        plies = self.plies() if self.depth_plies is None else self.depth_plies
+        if len(plies) < 2:
+            return 0.0
+        return (plies[-1] / plies[0]) ** (1 / (len(plies) - 1))
+
+    def timed(self, section, function, *args):
+        """function(*args), with its running time added to `section`."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.seconds[section] += time.perf_counter() - start
+
+    def counted(self, evaluate, children):
+        """(evaluate, children) wrapped to count, and with timing on time, the positions they score."""
+        def counted_evaluate(*args):
+            self.evaluations += 1
+            if self.timing:
+                return self.timed('evaluation', evaluate, *args)
+            return evaluate(*args)
+
+        def counted_children(moves, color):
+            self.evaluations += len(moves)
+            if self.timing:
+                return self.timed('evaluation', children, moves, color)
+            return children(moves, color)
+        return counted_evaluate, counted_children
+
+    def timed_iter(self, iterable, section):
+        """Iterate `iterable`, adding the time spent producing each item to `section`."""
+        iterator = iter(iterable)
+        seconds = self.seconds
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                seconds[section] += clock() - start
+                return
+            seconds[section] += clock() - start
+            yield item
+
+    def merge(self, other, ply=0):
+        """Add the counters of `other`, whose root was `ply` plies below this one's."""
+        for i, count in enumerate(other.plies()):
+            self.nodes_per_ply[ply + i] += count
+        self.cutoffs += other.cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.terminal_checks += other.terminal_checks
+        self.evaluations += other.evaluations
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+        for section in SECTIONS:
+            self.seconds[section] += other.seconds[section]
+
+    def to_dict(self):
+        return {
+            'nodes': self.nodes,
+            'nodes_per_ply': self.plies(),
+            'cutoffs': self.cutoffs,
+            'first_cutoff_rate': self.first_cutoff_rate(),
+            'terminal_checks': self.terminal_checks,
+            'evaluations': self.evaluations,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'branching_factor': self.branching_factor(),
+            'depth_plies': self.depth_plies,
+            'prepass': self.prepass,
+            'seconds': dict(self.seconds) if self.timing else None,
+            'depth_times': self.depth_times,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
@@ -0,0 +1,252 @@
+"""Threat-space search for forced wins.
+
+A full-width search at depth 4 cannot see a win that takes ten plies of
+threats, but such wins are narrow: every attacking move is a four the
+defender must block at one cell (VCF, victory by continuous fours) or an
+open three the defender must answer at one of a few cells (VCT, victory
+by continuous threats). Searching only those moves and replies finds
+them for a small, fixed node budget.
+
+immediate_move() is a much cheaper pre-pass for the obvious cases: a
+five to complete, an opponent four to block, or an open four to make.
+It works on whole bitboards at once and takes well under a millisecond.
+
+The search is sound but not complete: a line it returns wins against
+every defence, while a win it cannot prove within the budget, or one
+that needs the attacker to answer a counter-threat with a quiet move,
+is reported as None.
+"""
+
+from .board import BITS, DIRECTIONS, INDEX, WIN_COUNT, iter_indices, other_player
+from .evaluation import CELL_WINDOWS, WINDOW_MASKS, WINDOWS
+from .timeout import check_deadline
+
+VCF_BUDGET = 2000  # stones placed before a search gives up
+VCT_BUDGET = 2000
+
+
+def five_cells(own, empty):
+    """Bitboard of the empty cells where `own` would complete five in a row."""
+    cells = 0
+    for s in DIRECTIONS:
+        # shifted[i] has bit p set when own has a stone on p + i*s
+        shifted = [own >> (i * s) for i in range(WIN_COUNT)]
+        for gap in range(WIN_COUNT):
+            starts = -1
+            for i in range(WIN_COUNT):
+                if i != gap:
+                    starts &= shifted[i]
+            cells |= (starts << (gap * s)) & empty
+    return cells
+
+
+def immediate_move(board, player):
+    """The move `player` must play without searching, or None.
+
+    In order: complete a five; block the opponent's five (any of them if
+    there are several, as the game is lost anyway); make an open or
+    double four, which wins unless the opponent could make five first.
+    """
+    own = board.stones[player]
+    opp = board.stones[other_player(player)]
+    empty = board.empty_mask()
+    fives = five_cells(own, empty)
+    if fives:
+        return _cell(fives & -fives)
+    blocks = five_cells(opp, empty)
+    if blocks:
+        return _cell(blocks & -blocks)
+    for idx in iter_indices(_four_moves(own, empty)):
+        bit = BITS[idx]
+        if five_cells(own | bit, empty & ~bit).bit_count() >= 2:
+            return idx
+    return None
+
+
+def _four_moves(own, empty):
+    """Empty cells that give `own` four stones in some five-cell line, found like five_cells()."""
+    cells = 0
+    for s in DIRECTIONS:
+        shifted = [own >> (i * s) for i in range(WIN_COUNT)]
+        free = [empty >> (i * s) for i in range(WIN_COUNT)]
+        for gap in range(WIN_COUNT):
+            for other in range(gap + 1, WIN_COUNT):
+                # Lines with stones everywhere but two empty cells, gap and other
+                starts = free[gap] & free[other]
+                for i in range(WIN_COUNT):
+                    if i != gap and i != other:
+                        starts &= shifted[i]
+                cells |= starts << (gap * s) | starts << (other * s)
+    return cells
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def _cell(bit):
+    return INDEX[bit.bit_length() - 1]
+
+
+def _gaps(own, opp, count):
+    """Empty cells of every window holding `count` of `own`'s stones and none of `opp`'s."""
+    gaps = 0
+    for mask in WINDOW_MASKS:
+        if not mask & opp and (mask & own).bit_count() == count:
+            gaps |= mask & ~own
+    return gaps
+
+
+def _gaps_through(own, opp, idx, count):
+    """_gaps() restricted to the windows through idx."""
+    gaps = 0
+    for w in CELL_WINDOWS[idx]:
+        mask = WINDOW_MASKS[w]
+        if not mask & opp and (mask & own).bit_count() == count:
+            gaps |= mask & ~own
+    return gaps
+
+
+def _five_through(own, idx):
+    for w in CELL_WINDOWS[idx]:
+        mask = WINDOW_MASKS[w]
+        if own & mask == mask:
+            return True
+    return False
+
+
+class _ThreatSearch:
+    """One solve: the attacker's and defender's stones, the budget and the positions already refuted."""
+
+    def __init__(self, board, attacker, budget, threes, deadline=None, cancel=None):
+        self.own = board.stones[attacker]
+        self.opp = board.stones[other_player(attacker)]
+        self.budget = budget
+        self.threes = threes
+        self.deadline = deadline
+        self.cancel = cancel
+        self.nodes = 0
+        self.failed = set()
+
+    def count(self):
+        self.nodes += 1
+        if self.nodes > self.budget:
+            raise _OutOfBudget
+        check_deadline(self.deadline, self.cancel)
+
+    def solve(self):
+        fives = _gaps(self.own, self.opp, 4)
+        if fives:
+            return [_cell(fives & -fives)]
+        return self.attack(_gaps(self.opp, self.own, 4))
+
+    def attack(self, forced):
+        """Winning line for the attacker to move, or None; `forced` are the defender's five cells."""
+        key = (self.own, self.opp)
+        if key in self.failed or forced.bit_count() > 1:
+            return None
+        fours = _gaps(self.own, self.opp, 3)
+        moves = fours
+        if self.threes:
+            moves |= _gaps(self.own, self.opp, 2)
+        if forced:
+            # The defender threatens five: only blocking it can keep the initiative
+            moves &= forced
+        # An open or double four wins outright, so look for one before recursing
+        for idx in iter_indices(moves & fours):
+            if _gaps_through(self.own | BITS[idx], self.opp, idx, 4).bit_count() >= 2:
+                return [idx]
+        for idx in (*iter_indices(moves & fours), *iter_indices(moves & ~fours)):
+            line = self.threat(idx)
+            if line is not None:
+                return line
+        self.failed.add(key)
+        return None
+
+    def threat(self, idx):
+        """Winning line starting with the attacker playing idx, or None."""
+        self.count()
+        self.own |= BITS[idx]
+        try:
+            fives = _gaps_through(self.own, self.opp, idx, 4)
+            if fives.bit_count() >= 2:
+                return [idx]
+            if fives:
+                return self.defend(idx, fives)
+            if self.threes:
+                defences = self.three_defences(idx)
+                if defences:
+                    # Counter-fours also answer a three: they must be blocked first
+                    return self.defend(idx, defences | _gaps(self.opp, self.own, 3))
+            return None
+        finally:
+            self.own ^= BITS[idx]
+
+    def three_defences(self, idx):
+        """Cells that may stop the open three idx made, or 0 if it made none."""
+        defences = 0
+        threat = False
+        for w in CELL_WINDOWS[idx]:
+            mask = WINDOW_MASKS[w]
+            if mask & self.opp or (mask & self.own).bit_count() != 3:
+                continue
+            defences |= mask & ~self.own
+            for cell in WINDOWS[w]:
+                bit = BITS[cell]
+                if threat or self.own & bit:
+                    continue
+                if _gaps_through(self.own | bit, self.opp, cell, 4).bit_count() >= 2:
+                    threat = True
+        return defences if threat else 0
+
+    def defend(self, idx, replies):
+        """[idx, reply, ...] if the attacker wins after every defender reply in `replies`, else None."""
+        line = None
+        for reply in iter_indices(replies):
+            self.count()
+            bit = BITS[reply]
+            self.opp |= bit
+            try:
+                if _five_through(self.opp, reply):
+                    return None
+                rest = self.attack(_gaps_through(self.opp, self.own, reply, 4))
+            finally:
+                self.opp ^= bit
+            if rest is None:
+                return None
+            if line is None:
+                line = [idx, reply, *rest]
+        return line
+
+
+def find_forced_win(board, attacker, budget=VCF_BUDGET, threes=False, deadline=None, cancel=None):
+    """Forcing line that wins for `attacker`, to move on `board`, or None.
+
+    The line alternates attacker and defender moves and starts with the
+    attacker's; against a three it follows the first defence tried. Only
+    fours are searched unless `threes` is set, and then only once no
+    VCF was found. None also means the budget of stones placed ran out.
+    Like the other searches, it raises SearchTimeout once `deadline` has
+    passed or `cancel` is set.
+    """
+    search = _ThreatSearch(board, attacker, budget, False, deadline, cancel)
+    try:
+        line = search.solve()
+        if line is None and threes:
+            # Fours first: a VCF is shorter and far cheaper to find than a VCT
+            search.threes = True
+            search.failed.clear()
+            line = search.solve()
+    except _OutOfBudget:
+        return None
+    return line
+
+
+def vcf(board, attacker, budget=VCF_BUDGET, deadline=None, cancel=None):
+    """Victory by continuous fours; see find_forced_win()."""
+    return find_forced_win(board, attacker, budget, deadline=deadline, cancel=cancel)
+
+
+def vct(board, attacker, budget=VCT_BUDGET, deadline=None, cancel=None):
+    """Victory by continuous fours and open threes; see find_forced_win()."""
+    return find_forced_win(board, attacker, budget, True, deadline, cancel)
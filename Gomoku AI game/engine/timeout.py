@@ -0,0 +1,15 @@
+"""Deadline and cancel checks shared by the searches."""
+
+import time
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def check_deadline(deadline, cancel=None):
+    """Raise SearchTimeout once `deadline`, a time.perf_counter() value, has passed or `cancel` is set."""
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout
+    if cancel is not None and cancel.is_set():
+        raise SearchTimeout
@@ -0,0 +1,43 @@
+"""Fixed-size transposition table keyed by Zobrist hashes."""
+
+EXACT = 0
+LOWER = 1  # score is a lower bound (the search failed high)
+UPPER = 2  # score is an upper bound (the search failed low)
+
+# Rough size of one stored entry (tuple plus its ints) used to turn a
+# memory cap into a number of slots
+ENTRY_BYTES = 160
+
+
+class TranspositionTable:
+    """Two slots per bucket: one kept for the deepest search, one always replaced.
+
+    Entries are (key, depth, flag, score, move) tuples.
+    """
+
+    def __init__(self, size_mb=16):
+        self.buckets = max(1, size_mb * 2 ** 20 // (2 * ENTRY_BYTES))
+        self.slots = [None] * (2 * self.buckets)
+
+    def clear(self):
+        self.slots = [None] * (2 * self.buckets)
+
+    def probe(self, key):
+        """Return the stored entry for key, or None."""
+        i = 2 * (key % self.buckets)
+        entry = self.slots[i]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.slots[i + 1]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        i = 2 * (key % self.buckets)
+        deep = self.slots[i]
+        entry = (key, depth, flag, score, move)
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            self.slots[i] = entry
+        else:
+            self.slots[i + 1] = entry